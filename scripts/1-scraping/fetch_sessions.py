@@ -10,18 +10,29 @@ import csv
 import time
 import ssl
 import os
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for stage in ("6-analysis", "3-deduplication"):
+    sys.path.insert(0, os.path.join(SCRIPTS_DIR, stage))
+from aggregate_cube import Cube, hash_file, print_summary  # noqa: E402
+from artifacts import write_artifact  # noqa: E402
+from session_diff import changed_records, diff_collections  # noqa: E402
 
 BASE_URL = "https://cms-uatimpact.indiaai.in/api/session-cards"
 PAGE_SIZE = 25
 OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Fields that place a session in the schedule; a change to any of them is a move
+SLOT_FIELDS = ("date", "start_time", "end_time", "venue", "room")
+
 # Allow unverified SSL (some environments need this)
 ssl_ctx = ssl.create_default_context()
 ssl_ctx.check_hostname = False
 ssl_ctx.verify_mode = ssl.CERT_NONE
 
 
-def build_url(page: int) -> str:
+def build_url(page: int, base_url: str = BASE_URL) -> str:
     params = {
         "sort[0]": "date:asc",
         "sort[1]": "startTime:asc",
@@ -30,12 +41,12 @@ def build_url(page: int) -> str:
         "pagination[page]": str(page),
         "pagination[pageSize]": str(PAGE_SIZE),
     }
-    return f"{BASE_URL}?{urllib.parse.urlencode(params)}"
+    return f"{base_url}?{urllib.parse.urlencode(params)}"
 
 
-def fetch_page(page: int, retries: int = 3) -> dict:
+def fetch_page(page: int, retries: int = 3, base_url: str = BASE_URL) -> dict:
     """Fetch a single page with retry logic."""
-    url = build_url(page)
+    url = build_url(page, base_url)
     for attempt in range(retries):
         try:
             req = urllib.request.Request(url, headers={
@@ -77,6 +88,20 @@ def extract_session(item: dict) -> dict:
     }
 
 
+def print_schedule_changes(changeset: dict, limit: int = 20):
+    """Added, removed and moved sessions from a session_diff changeset (keyed by id)."""
+    summary = changeset["summary"]
+    moved = [entry for entry in changeset["changed"] if any(f in entry["fields"] for f in SLOT_FIELDS)]
+    print(f"\nSince last scrape: {summary['added']} added, {summary['removed']} removed, "
+          f"{len(moved)} moved ({summary['changed']} changed in total)")
+    for entry in moved[:limit]:
+        fields = entry["fields"]
+        print(f"  [{entry['key']}] " + ", ".join(
+            f"{f}: {fields[f]['old']!r} -> {fields[f]['new']!r}" for f in SLOT_FIELDS if f in fields))
+    if len(moved) > limit:
+        print(f"  ... {len(moved) - limit} more")
+
+
 def main():
     print("=" * 60)
     print("India AI Impact Summit 2026 - Session Data Fetcher")
@@ -122,10 +147,16 @@ def main():
     if failed_pages:
         print(f"Failed pages: {failed_pages}")
 
-    # Step 3: Save as JSON
+    # Step 3: Save as JSON (keeping the previous scrape to diff against)
     json_path = os.path.join(OUTPUT_DIR, "sessions.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(all_sessions, f, indent=2, ensure_ascii=False)
+    previous_sessions = None
+    changeset = None
+    if os.path.exists(json_path):
+        previous_version = hash_file(json_path)
+        with open(json_path, "r", encoding="utf-8") as f:
+            previous_sessions = json.load(f)
+        changeset = diff_collections(previous_sessions, all_sessions, "id")
+    write_artifact(json_path, all_sessions)
     print(f"\nSaved JSON: {json_path}")
 
     # Step 4: Save as CSV
@@ -138,21 +169,24 @@ def main():
             writer.writerows(all_sessions)
         print(f"Saved CSV: {csv_path}")
 
-    # Step 5: Print summary by date
-    print("\n" + "=" * 60)
-    print("SESSIONS BY DATE:")
-    print("=" * 60)
-    from collections import Counter
-    date_counts = Counter(s["date"] for s in all_sessions)
-    for date, count in sorted(date_counts.items()):
-        print(f"  {date}: {count} sessions")
-
-    print("\n" + "=" * 60)
-    print("SESSIONS BY VENUE:")
-    print("=" * 60)
-    venue_counts = Counter(s["venue"] for s in all_sessions if s["venue"])
-    for venue, count in sorted(venue_counts.items(), key=lambda x: -x[1]):
-        print(f"  {venue}: {count} sessions")
+    # Step 5: Update the aggregate cube for this scrape and print the summary from it.
+    # If the saved cube is the previous scrape's, only the changed sessions are applied.
+    cube_path = os.path.join(OUTPUT_DIR, "sessions_cube.json")
+    cube = Cube.load(cube_path) if changeset is not None and os.path.exists(cube_path) else None
+    if cube is not None and cube.version == previous_version:
+        old, new = changed_records(changeset, previous_sessions, all_sessions)
+        cube.update(old, new)
+        cube.version = hash_file(json_path)
+        print(f"Updated cube incrementally: {len(old)} sessions retracted, {len(new)} added")
+    else:
+        cube = Cube.build(all_sessions, version=hash_file(json_path))
+    cube.save(cube_path)
+    print(f"Saved cube: {cube_path}")
+    print_summary(cube)
+
+    # Step 6: Report what was added, removed or moved since the previous scrape
+    if changeset is not None:
+        print_schedule_changes(changeset)
 
     print(f"\nDone! Check {json_path} and {csv_path}")
 
@@ -0,0 +1,303 @@
+"""
+Streaming HTML Ingestion
+Extracts session cards from saved official-site schedule pages
+(e.g. data/raw/18th feb.html) and exhibitor entries from the expo list
+(data/raw/Expo_List.html) with an incremental tokenizer: files are fed in
+fixed-size chunks and records are emitted as soon as their card closes, so
+memory stays flat no matter how many daily snapshots are ingested.
+
+Session records have the same shape as extract_session() in
+fetch_sessions.py; exhibitor records match expolist.json.
+
+Usage:
+    python ingest_html.py sessions "../../data/raw/18th feb.html" [more.html ...] [-o sessions_html.json]
+    python ingest_html.py expo ../../data/raw/Expo_List.html [-o expolist.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from datetime import datetime
+from html.parser import HTMLParser
+
+CHUNK_SIZE = 64 * 1024
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# icon next to each meta value on a session card -> field
+META_ICONS = {
+    "calendar.svg": "date",
+    "clock.svg": "time",
+    "mapPin.svg": "venue",
+    "auditorium.svg": "room",
+}
+
+
+def _classes(attrs: dict) -> set:
+    return set((attrs.get("class") or "").split())
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def parse_card_date(value: str):
+    """'18 Feb 2026' -> '2026-02-18'."""
+    try:
+        return datetime.strptime(value.strip(), "%d %b %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def parse_card_time(value: str):
+    """'9:15 AM' -> '09:15:00.000' (the CMS API's startTime format)."""
+    try:
+        return datetime.strptime(value.strip(), "%I:%M %p").strftime("%H:%M:%S.000")
+    except ValueError:
+        return None
+
+
+class _StreamingParser(HTMLParser):
+    """Base: tracks element depth and hands finished records to `self.records`."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.depth = 0
+        self.records = []
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def drain(self) -> list:
+        records, self.records = self.records, []
+        return records
+
+
+class SessionCardParser(_StreamingParser):
+    def __init__(self):
+        super().__init__()
+        self.card = None          # fields of the card being read
+        self.card_depth = None    # depth at which the card's root div was opened
+        self.capture = None       # (field, depth) while collecting text
+        self.skip_depth = None    # inside a "Read More" link
+        self.section = None
+        self.meta_field = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = _classes(attrs)
+        if tag not in VOID_TAGS:
+            self.depth += 1
+
+        if self.card is None:
+            if tag == "div" and {"tw:rounded-3xl", "tw:border-primary-50"} <= classes:
+                self.card = {"title": [], "subtitle": [], "description": [], "speakers": [],
+                             "knowledge_partners": [], "date": "", "time": "", "venue": "",
+                             "room": "", "add_to_calendar": False}
+                self.card_depth = self.depth
+                self.section = None
+            return
+
+        if tag == "img":
+            src = attrs.get("src") or ""
+            for icon, field in META_ICONS.items():
+                if src.endswith("/sessions/" + icon):
+                    self.meta_field = field
+            if self.section == "Knowledge Partners" and attrs.get("alt"):
+                self.card["knowledge_partners"].append(attrs["alt"].strip())
+            return
+
+        if self.capture is not None:
+            if "tw:cursor-pointer" in classes:
+                self.skip_depth = self.depth
+            return
+
+        if tag == "span" and "tw:block" in classes and "tw:text-grey-main" in classes:
+            self.capture = ("title", self.depth)
+        elif tag == "span" and "tw:text-[#7A7A7A]" in classes:
+            self.capture = ("subtitle", self.depth)
+        elif tag == "span" and "tw:md:typography-body-3" in classes and self.meta_field:
+            self.capture = (self.meta_field, self.depth)
+            self.meta_field = None
+        elif tag == "div" and "tw:lg:typography-headline-5" in classes:
+            self.capture = ("section", self.depth)
+            self.section = ""
+        elif tag == "div" and "tw:font-semibold" in classes and "tw:whitespace-nowrap" in classes:
+            self.card["speakers"].append("")
+            self.capture = ("speakers", self.depth)
+        elif tag == "div" and "tw:typography-body-2" in classes and "tw:text-grey-300" in classes:
+            self.capture = ("description", self.depth)
+        elif tag == "div" and not classes and self.section == "Knowledge Partners":
+            self.card["knowledge_partners"].append("")
+            self.capture = ("knowledge_partners", self.depth)
+
+    def handle_data(self, data):
+        if self.card is None:
+            return
+        if self.capture is None:
+            if _clean(data) == "Add to Calendar":
+                self.card["add_to_calendar"] = True
+            return
+        if self.skip_depth is not None:
+            return
+        field = self.capture[0]
+        if field == "section":
+            self.section += data
+        elif field in ("speakers", "knowledge_partners"):
+            self.card[field][-1] += data
+        elif isinstance(self.card[field], list):
+            self.card[field].append(data)
+        else:
+            self.card[field] += data
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        if self.skip_depth is not None and self.depth == self.skip_depth:
+            self.skip_depth = None
+        if self.capture is not None and self.depth == self.capture[1]:
+            if self.capture[0] == "section":
+                self.section = _clean(self.section)
+            self.capture = None
+        if self.card is not None and self.depth == self.card_depth:
+            self.records.append(self._to_session(self.card))
+            self.card = None
+        self.depth -= 1
+
+    @staticmethod
+    def _to_session(card: dict) -> dict:
+        """Same keys and value formats as fetch_sessions.extract_session()."""
+        start, _, end = card["time"].partition(" - ")
+        title = _clean("".join(card["title"]))
+        subtitle = _clean("".join(card["subtitle"]))
+        speakers = [_clean(s) for s in card["speakers"] if _clean(s)]
+        partners = [_clean(p) for p in card["knowledge_partners"] if _clean(p)]
+        return {
+            "id": None,
+            "title": f"{title}: {subtitle}" if subtitle else title,
+            "description": _clean("".join(card["description"])),
+            "date": parse_card_date(card["date"]),
+            "start_time": parse_card_time(start),
+            "end_time": parse_card_time(end) if end else None,
+            "venue": _clean(card["venue"]) or None,
+            "room": _clean(card["room"]) or None,
+            "speakers": "; ".join(speakers),
+            "knowledge_partners": "; ".join(dict.fromkeys(partners)),
+            "session_type": "",
+            "event_id": None,
+            "add_to_calendar": card["add_to_calendar"],
+            "notes": None,
+        }
+
+
+class ExhibitorParser(_StreamingParser):
+    def __init__(self, start_id: int = 1):
+        super().__init__()
+        self.next_id = start_id
+        self.card = None
+        self.card_depth = None
+        self.in_name = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag not in VOID_TAGS:
+            self.depth += 1
+        if self.card is None:
+            if tag == "div" and "exhibitor-cards" in _classes(attrs):
+                self.card = {"logo_url": None, "alt_text": "", "name": ""}
+                self.card_depth = self.depth
+            return
+        if tag == "img" and self.card["logo_url"] is None:
+            self.card["logo_url"] = attrs.get("src")
+            self.card["alt_text"] = (attrs.get("alt") or "").strip()
+        elif tag == "strong":
+            self.in_name = True
+
+    def handle_data(self, data):
+        if self.card is not None and self.in_name:
+            self.card["name"] += data
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        if tag == "strong":
+            self.in_name = False
+        if self.card is not None and self.depth == self.card_depth:
+            self.records.append({
+                "id": self.next_id,
+                "name": _clean(self.card["name"]),
+                "logo_url": self.card["logo_url"],
+                "alt_text": self.card["alt_text"],
+            })
+            self.next_id += 1
+            self.card = None
+        self.depth -= 1
+
+
+def stream_records(path: str, parser: _StreamingParser, stats: dict = None):
+    """Feed a file chunk by chunk and yield records as soon as they complete."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if stats is not None:
+                stats["bytes"] += len(chunk.encode("utf-8"))
+            parser.feed(chunk)
+            yield from parser.drain()
+    parser.close()
+    yield from parser.drain()
+
+
+def ingest(kind: str, paths: list, output_path: str) -> dict:
+    """Stream every input into one JSON array on disk; returns count and throughput."""
+    stats = {"bytes": 0, "records": 0}
+    start = time.perf_counter()
+    exhibitor_id = 1
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        for path in paths:
+            if kind == "sessions":
+                parser = SessionCardParser()
+            else:
+                parser = ExhibitorParser(start_id=exhibitor_id)
+            file_records = 0
+            for record in stream_records(path, parser, stats):
+                out.write(",\n  " if stats["records"] else "\n  ")
+                out.write(json.dumps(record, ensure_ascii=False))
+                stats["records"] += 1
+                file_records += 1
+            if kind == "expo":
+                exhibitor_id = parser.next_id
+            print(f"  ✓ {os.path.basename(path)}: {file_records} records")
+        out.write("\n]\n")
+    os.replace(tmp_path, output_path)
+    stats["elapsed"] = time.perf_counter() - start
+    stats["mb_per_s"] = stats["bytes"] / 1e6 / stats["elapsed"] if stats["elapsed"] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming ingestion of saved schedule/expo HTML pages")
+    parser.add_argument("kind", choices=["sessions", "expo"])
+    parser.add_argument("paths", nargs="+", help="HTML files to ingest")
+    parser.add_argument("-o", "--output", help="output JSON (default: sessions_html.json / expolist.json)")
+    args = parser.parse_args()
+
+    output = args.output or ("sessions_html.json" if args.kind == "sessions" else "expolist.json")
+    print("=" * 60)
+    print(f"HTML INGESTION ({args.kind})")
+    print("=" * 60)
+    stats = ingest(args.kind, args.paths, output)
+    print(f"\nRecords: {stats['records']}")
+    print(f"Read {stats['bytes'] / 1e6:.2f} MB in {stats['elapsed']:.2f}s ({stats['mb_per_s']:.1f} MB/s)")
+    print(f"Saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
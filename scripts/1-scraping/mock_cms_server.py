@@ -0,0 +1,185 @@
+"""
+Local Stand-In for the Session Cards API
+Serves GET /api/session-cards in the CMS's paginated shape from a scraped
+sessions.json, so fetch_sessions.py and watch_sessions.py can run without
+network access. With --churn it edits the schedule every few seconds the
+way the live CMS does during the event: reschedules, room moves, speaker
+changes, cancellations and new sessions.
+
+Usage:
+    python mock_cms_server.py [--port 8781] [--data ../../data/raw/sessions.json] [--churn 10]
+    python watch_sessions.py --base-url http://127.0.0.1:8781/api/session-cards --queue-dir /tmp/changes
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+SESSIONS_PATH = os.path.join(DATA_DIR, "raw", "sessions.json")
+
+API_PATH = "/api/session-cards"
+MUTATIONS = ("reschedule", "move_room", "change_speakers", "cancel", "add")
+
+
+def to_item(session: dict) -> dict:
+    """Flat session record -> API item (inverse of fetch_sessions.extract_session)."""
+    def split(value):
+        return [part for part in (value or "").split("; ") if part]
+
+    return {
+        "id": session.get("id"),
+        "title": session.get("title"),
+        "description": session.get("description"),
+        "date": session.get("date"),
+        "startTime": session.get("start_time"),
+        "endTime": session.get("end_time"),
+        "venue": session.get("venue"),
+        "room": session.get("room"),
+        "speakers": [{"heading": name} for name in split(session.get("speakers"))],
+        "knowledgePartners": [{"title": name} for name in split(session.get("knowledge_partners"))],
+        "sessionType": {"displayLabel": session.get("session_type") or ""},
+        "eventID": session.get("event_id"),
+        "addToCalendar": session.get("add_to_calendar"),
+        "notes": session.get("notes"),
+    }
+
+
+class Schedule:
+    """The stand-in's session list, edited in place by mutate()."""
+
+    def __init__(self, sessions: list, seed: int = 0):
+        self.sessions = [copy.deepcopy(s) for s in sessions]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.next_id = max((s["id"] for s in sessions if isinstance(s.get("id"), int)), default=0) + 1
+        self.log = []
+
+    def page(self, page: int, page_size: int) -> dict:
+        with self.lock:
+            ordered = sorted(self.sessions, key=lambda s: (s.get("date") or "", s.get("start_time") or ""))
+            total = len(ordered)
+            items = ordered[(page - 1) * page_size:page * page_size]
+            return {
+                "data": [to_item(s) for s in items],
+                "meta": {"pagination": {
+                    "page": page,
+                    "pageSize": page_size,
+                    "pageCount": (total + page_size - 1) // page_size,
+                    "total": total,
+                }},
+            }
+
+    def mutate(self, kind: str = None) -> dict:
+        """Apply one random edit; returns what was done."""
+        with self.lock:
+            kind = kind or self.rng.choice(MUTATIONS)
+            session = self.rng.choice(self.sessions)
+            change = {"kind": kind, "id": session["id"]}
+            if kind == "reschedule" and session.get("start_time"):
+                hour, minute = (int(x) for x in session["start_time"][:5].split(":"))
+                minutes = hour * 60 + minute + self.rng.choice((-60, -30, 30, 60))
+                session["start_time"] = f"{minutes // 60 % 24:02d}:{minutes % 60:02d}:00.000"
+                change["start_time"] = session["start_time"]
+            elif kind == "move_room":
+                rooms = sorted({s["room"] for s in self.sessions if s.get("room") and s.get("venue") == session.get("venue")})
+                session["room"] = self.rng.choice(rooms) if rooms else session.get("room")
+                change["room"] = session["room"]
+            elif kind == "change_speakers":
+                speakers = [name for name in (session.get("speakers") or "").split("; ") if name]
+                if speakers and self.rng.random() < 0.5:
+                    speakers.pop(self.rng.randrange(len(speakers)))
+                else:
+                    speakers.append(f"Guest Speaker {self.rng.randrange(1000)}")
+                session["speakers"] = "; ".join(speakers)
+                change["speakers"] = session["speakers"]
+            elif kind == "cancel":
+                self.sessions.remove(session)
+            else:
+                added = copy.deepcopy(session)
+                added["id"] = self.next_id
+                added["event_id"] = f"mock{self.next_id:020d}"
+                added["title"] = f"{session.get('title') or 'Session'} (Repeat)"
+                self.next_id += 1
+                self.sessions.append(added)
+                change = {"kind": kind, "id": added["id"]}
+            self.log.append(change)
+            return change
+
+
+class MockCMSHandler(BaseHTTPRequestHandler):
+    schedule = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path.rstrip("/") != API_PATH:
+            self.send_error(404)
+            return
+        params = urllib.parse.parse_qs(url.query)
+        try:
+            page = max(1, int(params.get("pagination[page]", ["1"])[0]))
+            page_size = max(1, int(params.get("pagination[pageSize]", ["25"])[0]))
+        except ValueError:
+            self.send_error(400)
+            return
+        body = json.dumps(self.schedule.page(page, page_size), ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start(sessions: list, port: int = 0, churn: float = 0.0, seed: int = 0) -> ThreadingHTTPServer:
+    """Start the stand-in on a background thread; port 0 picks a free one.
+
+    The schedule is reachable as server.schedule, so callers can mutate() it
+    themselves instead of (or as well as) using churn.
+    """
+    schedule = Schedule(sessions, seed)
+    handler = type("Handler", (MockCMSHandler,), {"schedule": schedule})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.schedule = schedule
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    if churn > 0:
+        def churn_loop():
+            while True:
+                time.sleep(churn)
+                change = schedule.mutate()
+                print(f"  churn: {change}")
+        threading.Thread(target=churn_loop, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the session cards API")
+    parser.add_argument("--port", type=int, default=8781)
+    parser.add_argument("--data", default=SESSIONS_PATH, help="sessions JSON to serve")
+    parser.add_argument("--churn", type=float, default=0.0, help="seconds between random schedule edits (0: static)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.data, "r", encoding="utf-8") as f:
+        sessions = json.load(f)
+    server = start(sessions, args.port, args.churn, args.seed)
+    print(f"Mock CMS on http://127.0.0.1:{server.server_address[1]}{API_PATH} "
+          f"({len(sessions)} sessions, churn {'every %ss' % args.churn if args.churn else 'off'})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Session Watcher
+Long-running poller for the session cards API. Each poll re-reads every
+page with fetch_page()/extract_session(), diffs the result against the
+previous scrape by id and turns the changeset into per-session
+notifications:
+
+    rescheduled        date / start_time / end_time changed
+    room_moved         venue / room changed
+    speakers_changed   speakers changed
+    updated            any other field changed
+    new / cancelled    session appeared / disappeared
+
+Notifications go to local subscribers: a spool directory of JSON batches
+(written atomically, one file per poll, consumers delete what they have
+processed) and/or a local webhook that receives the same batch as a POST.
+The occupancy index is kept current from the same changeset, so moves carry
+their old and new slot.
+
+The interval adapts: it drops to --min-interval as soon as a poll finds
+changes and grows by --backoff after every quiet (or failed) poll, up to
+--max-interval. A poll with a failed page is never diffed, so a flaky page
+doesn't look like a wave of cancellations.
+
+Usage:
+    python watch_sessions.py [--queue-dir ../../data/changes] [--webhook http://127.0.0.1:9000/hook]
+    python watch_sessions.py --base-url http://127.0.0.1:8781/api/session-cards --min-interval 2 --page-delay 0
+    python watch_sessions.py --once      # one poll against the saved sessions.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+from fetch_sessions import BASE_URL, OUTPUT_DIR, extract_session, fetch_page
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for stage in ("3-deduplication", "7-serving"):
+    sys.path.insert(0, os.path.join(SCRIPTS_DIR, stage))
+from artifacts import write_artifact  # noqa: E402
+from occupancy_index import OccupancyIndex, print_moves  # noqa: E402
+from session_diff import diff_collections  # noqa: E402
+from snapshot_store import atomic_write  # noqa: E402
+
+DATA_DIR = os.path.normpath(os.path.join(SCRIPTS_DIR, "..", "data"))
+QUEUE_DIR = os.path.join(DATA_DIR, "changes")
+
+# Notification kind -> fields that trigger it; one change can raise several kinds
+CHANGE_KINDS = (
+    ("rescheduled", ("date", "start_time", "end_time")),
+    ("room_moved", ("venue", "room")),
+    ("speakers_changed", ("speakers",)),
+)
+
+
+class AdaptiveInterval:
+    """Seconds to wait before the next poll."""
+
+    def __init__(self, minimum: float = 30.0, maximum: float = 600.0, backoff: float = 2.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.current = minimum
+
+    def changed(self) -> float:
+        self.current = self.minimum
+        return self.current
+
+    def quiet(self) -> float:
+        self.current = min(self.maximum, self.current * self.backoff)
+        return self.current
+
+
+def fetch_all(base_url: str = BASE_URL, page_delay: float = 0.5):
+    """Every session on the API, or None if any page failed."""
+    first = fetch_page(1, base_url=base_url)
+    if not first or "data" not in first:
+        return None
+    sessions = [extract_session(item) for item in first["data"]]
+    page_count = first.get("meta", {}).get("pagination", {}).get("pageCount", 0)
+    for page in range(2, page_count + 1):
+        time.sleep(page_delay)
+        result = fetch_page(page, base_url=base_url)
+        if not result or "data" not in result:
+            print(f"  ⚠️  page {page}/{page_count} failed; skipping this poll")
+            return None
+        sessions.extend(extract_session(item) for item in result["data"])
+    return sessions
+
+
+def classify(fields: dict) -> list:
+    """Notification kinds for one changed record's field paths."""
+    kinds = [kind for kind, watched in CHANGE_KINDS if any(f in fields for f in watched)]
+    if any(not any(f in watched for _, watched in CHANGE_KINDS) for f in fields):
+        kinds.append("updated")
+    return kinds
+
+
+def notifications(changeset: dict, moves: list) -> list:
+    """One notification per added, removed or changed session.
+
+    Repeated-id keys ((id, n) tuples) are left out, matching the occupancy
+    index: the CMS's duplicated ids are the same session listed twice.
+    """
+    slots = {move["id"]: move for move in moves}
+
+    def note(kind, session_id, record, changes=None):
+        move = slots.get(session_id, {})
+        return {
+            "kind": kind,
+            "id": session_id,
+            "event_id": record.get("event_id"),
+            "title": record.get("title"),
+            "changes": changes or {},
+            "from": move.get("from"),
+            "to": move.get("to"),
+        }
+
+    notes = []
+    for entry in changeset["added"]:
+        if not isinstance(entry["key"], tuple):
+            notes.append(note("new", entry["key"], entry["record"]))
+    for entry in changeset["removed"]:
+        if not isinstance(entry["key"], tuple):
+            notes.append(note("cancelled", entry["key"], entry["record"]))
+    for entry in changeset["changed"]:
+        if not isinstance(entry["key"], tuple):
+            record = entry["record"]
+            for kind in classify(entry["fields"]):
+                notes.append(note(kind, entry["key"], record, entry["fields"]))
+    return notes
+
+
+class FileQueue:
+    """Spool directory: one <sequence>-<timestamp>.json batch per poll with changes."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        existing = [name for name in os.listdir(directory) if name.endswith(".json")]
+        self.sequence = max((int(name.split("-")[0]) for name in existing if name.split("-")[0].isdigit()), default=0)
+
+    def publish(self, batch: dict) -> str:
+        self.sequence += 1
+        stamp = batch["detected_at"].replace(":", "").replace("-", "")
+        path = os.path.join(self.directory, f"{self.sequence:08d}-{stamp}.json")
+        atomic_write(path, (json.dumps(batch, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+        return path
+
+
+class Webhook:
+    """POSTs each batch as JSON; a subscriber that is down doesn't stop the watcher."""
+
+    def __init__(self, url: str, retries: int = 3, timeout: float = 5.0):
+        self.url = url
+        self.retries = retries
+        self.timeout = timeout
+
+    def publish(self, batch: dict) -> str:
+        body = json.dumps(batch, ensure_ascii=False).encode("utf-8")
+        for attempt in range(self.retries):
+            try:
+                req = urllib.request.Request(self.url, data=body, method="POST",
+                                             headers={"Content-Type": "application/json"})
+                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                    return f"{self.url} ({resp.status})"
+            except Exception as e:
+                print(f"  Attempt {attempt + 1}/{self.retries} for {self.url} failed: {e}")
+                if attempt < self.retries - 1:
+                    time.sleep(2 * (attempt + 1))
+        return None
+
+
+class SessionWatcher:
+    def __init__(self, sessions: list, publishers: list, base_url: str = BASE_URL,
+                 output_path: str = None, page_delay: float = 0.5):
+        self.sessions = sessions
+        self.index = OccupancyIndex.build(sessions)
+        self.publishers = publishers
+        self.base_url = base_url
+        self.output_path = output_path
+        self.page_delay = page_delay
+        self.polls = 0
+
+    def poll(self):
+        """Fetch, diff and publish; returns the notifications, or None if the fetch failed."""
+        self.polls += 1
+        current = fetch_all(self.base_url, self.page_delay)
+        if current is None:
+            return None
+        changeset = diff_collections(self.sessions, current, "id")
+        if not (changeset["added"] or changeset["removed"] or changeset["changed"]):
+            return []
+
+        # diff_collections reports changed fields only; notifications want the whole record
+        by_id = {s.get("id"): s for s in reversed(current)}
+        for entry in changeset["changed"]:
+            entry["record"] = by_id.get(entry["key"], {})
+        moves = self.index.apply_changes(changeset)
+        notes = notifications(changeset, moves)
+        self.sessions = current
+        if self.output_path:
+            write_artifact(self.output_path, current)
+
+        batch = {
+            "detected_at": datetime.now().isoformat(timespec="seconds"),
+            "poll": self.polls,
+            "summary": changeset["summary"],
+            "notifications": notes,
+        }
+        for publisher in self.publishers:
+            target = publisher.publish(batch)
+            if target:
+                print(f"  ✓ Published {len(notes)} notifications -> {target}")
+        if moves:
+            print_moves(moves)
+        return notes
+
+    def run(self, interval: AdaptiveInterval, max_polls: int = None):
+        while max_polls is None or self.polls < max_polls:
+            start = time.perf_counter()
+            notes = self.poll()
+            elapsed = time.perf_counter() - start
+            stamp = datetime.now().strftime("%H:%M:%S")
+            if notes is None:
+                wait = interval.quiet()
+                print(f"[{stamp}] poll {self.polls}: fetch failed ({elapsed:.1f}s); next in {wait:.0f}s")
+            elif notes:
+                wait = interval.changed()
+                print(f"[{stamp}] poll {self.polls}: {len(notes)} changes in {len(self.sessions)} sessions "
+                      f"({elapsed:.1f}s); next in {wait:.0f}s")
+            else:
+                wait = interval.quiet()
+                print(f"[{stamp}] poll {self.polls}: no changes ({elapsed:.1f}s); next in {wait:.0f}s")
+            if max_polls is None or self.polls < max_polls:
+                time.sleep(wait)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll the session cards API and publish schedule changes")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--output", default=os.path.join(OUTPUT_DIR, "sessions.json"),
+                        help="baseline scrape, rewritten after every poll with changes")
+    parser.add_argument("--queue-dir", help=f"spool directory for change batches (e.g. {QUEUE_DIR})")
+    parser.add_argument("--webhook", help="local URL to POST change batches to")
+    parser.add_argument("--min-interval", type=float, default=30.0, help="seconds between polls while changes arrive")
+    parser.add_argument("--max-interval", type=float, default=600.0, help="longest wait after quiet polls")
+    parser.add_argument("--backoff", type=float, default=2.0, help="interval multiplier after a quiet poll")
+    parser.add_argument("--page-delay", type=float, default=0.5, help="seconds between page requests")
+    parser.add_argument("--max-polls", type=int, help="stop after this many polls")
+    parser.add_argument("--once", action="store_true", help="single poll (same as --max-polls 1)")
+    args = parser.parse_args()
+
+    publishers = []
+    if args.queue_dir:
+        publishers.append(FileQueue(args.queue_dir))
+    if args.webhook:
+        publishers.append(Webhook(args.webhook))
+
+    print("=" * 60)
+    print("SESSION WATCHER")
+    print("=" * 60)
+    print(f"Source: {args.base_url}")
+    subscribers = [target for target in (args.queue_dir, args.webhook) if target]
+    print(f"Subscribers: {', '.join(subscribers) or 'none (log only)'}")
+
+    if os.path.exists(args.output):
+        with open(args.output, "r", encoding="utf-8") as f:
+            sessions = json.load(f)
+        print(f"Baseline: {len(sessions)} sessions from {args.output}")
+    else:
+        print("No baseline yet; fetching one...")
+        sessions = fetch_all(args.base_url, args.page_delay)
+        if sessions is None:
+            print("ERROR: Could not fetch a baseline. Exiting.")
+            return 1
+        write_artifact(args.output, sessions)
+        print(f"Baseline: {len(sessions)} sessions saved to {args.output}")
+
+    watcher = SessionWatcher(sessions, publishers, args.base_url, args.output, args.page_delay)
+    interval = AdaptiveInterval(args.min_interval, args.max_interval, args.backoff)
+    try:
+        watcher.run(interval, 1 if args.once else args.max_polls)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
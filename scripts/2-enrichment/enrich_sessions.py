@@ -0,0 +1,315 @@
+"""
+Cached Session Enrichment Runner
+Generates summary_one_liner, technical_depth, target_personas, keywords and
+networking_signals for scraped sessions (the shape extract_session produces).
+
+Each session's source fields are hashed and looked up in a persistent
+on-disk cache; only misses go to the model, in concurrent, rate-limited
+batches. Re-running after a rescrape costs only what actually changed.
+
+Usage:
+    python enrich_sessions.py sessions.json sessions_enriched.json
+    python enrich_sessions.py sessions.json out.json --endpoint http://127.0.0.1:8780/v1/messages
+    python enrich_sessions.py sessions.json out.json --workers 4 --rate 2 --batch-size 10
+
+The API key is read from ANTHROPIC_API_KEY or the .env file next to this
+script (same as enrich_v2.js). A local endpoint such as mock_llm_server.py
+needs no key.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "3-deduplication"))
+from artifacts import write_artifact  # noqa: E402
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ENDPOINT = "https://api.anthropic.com/v1/messages"
+DEFAULT_CACHE = os.path.join(SCRIPT_DIR, "enrichment_cache.jsonl")
+MODEL = "claude-haiku-4-5-20251001"
+PROMPT_VERSION = "1"
+
+# Fields from extract_session that determine the enrichment
+SOURCE_FIELDS = ("title", "description", "speakers", "knowledge_partners", "session_type")
+ENRICHED_FIELDS = ("summary_one_liner", "technical_depth", "target_personas", "keywords", "networking_signals")
+SIGNAL_FIELDS = ("is_heavy_hitter", "decision_maker_density", "investor_presence")
+
+SYSTEM = """You enrich AI conference session data. For each session, generate exactly 5 fields based on its title, description, speakers, knowledge partners and session type.
+
+Rules:
+- summary_one_liner: One punchy sentence (max 80 chars) on why someone should attend.
+- technical_depth: Integer 1-5 (1 = general audience, 5 = deep technical).
+- target_personas: 3-5 specific types of people who would get the most out of it.
+- keywords: 3-5 lowercase topic tags.
+- networking_signals: { "is_heavy_hitter": bool, "decision_maker_density": "Low" | "Medium" | "High", "investor_presence": "Unlikely" | "Possible" | "Likely" }
+
+Output ONLY a JSON array. No markdown, no explanation. Each item must have: { "ref": N, "summary_one_liner": "...", "technical_depth": N, "target_personas": [...], "keywords": [...], "networking_signals": {...} }"""
+
+
+def load_api_key() -> str:
+    key = os.environ.get("ANTHROPIC_API_KEY")
+    env_path = os.path.join(SCRIPT_DIR, ".env")
+    if not key and os.path.exists(env_path):
+        with open(env_path, "r", encoding="utf-8") as f:
+            for line in f:
+                name, _, value = line.partition("=")
+                if name.strip() == "ANTHROPIC_API_KEY":
+                    key = value.strip()
+    return key
+
+
+def is_valid_enrichment(item: dict) -> bool:
+    """Only complete, well-formed items may enter the cache; anything else is retried next run."""
+    if not isinstance(item, dict) or any(field not in item for field in ENRICHED_FIELDS):
+        return False
+    depth = item["technical_depth"]
+    signals = item["networking_signals"]
+    return (isinstance(depth, int) and not isinstance(depth, bool) and 1 <= depth <= 5
+            and all(isinstance(item[f], list) and item[f] for f in ("target_personas", "keywords"))
+            and isinstance(signals, dict) and all(f in signals for f in SIGNAL_FIELDS))
+
+
+def source_hash(session: dict) -> str:
+    """Cache key: source fields + prompt version + model."""
+    payload = {field: session.get(field) for field in SOURCE_FIELDS}
+    payload["_prompt"] = PROMPT_VERSION
+    payload["_model"] = MODEL
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class EnrichmentCache:
+    """Append-only JSONL cache of source hash -> enrichment fields."""
+
+    def __init__(self, path: str = DEFAULT_CACHE):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+                    if is_valid_enrichment(entry.get("enrichment")):
+                        self.entries[entry["hash"]] = entry["enrichment"]
+
+    def get(self, digest: str):
+        return self.entries.get(digest)
+
+    def put_many(self, items: dict):
+        """Persist a batch of results with one append."""
+        lines = "".join(json.dumps({"hash": h, "enrichment": e}, ensure_ascii=False) + "\n"
+                        for h, e in items.items())
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries.update(items)
+
+
+class RateLimiter:
+    """Token bucket shared by the worker threads (requests per second)."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def call_model(endpoint: str, api_key: str, user: str, retries: int = 2) -> list:
+    """One Messages API call; returns the JSON array from the reply text."""
+    body = json.dumps({
+        "model": MODEL,
+        "max_tokens": 4096,
+        "system": SYSTEM,
+        "messages": [{"role": "user", "content": user}],
+    }).encode("utf-8")
+    headers = {"Content-Type": "application/json", "anthropic-version": "2023-06-01"}
+    if api_key:
+        headers["x-api-key"] = api_key
+
+    for attempt in range(retries + 1):
+        try:
+            req = urllib.request.Request(endpoint, data=body, headers=headers, method="POST")
+            with urllib.request.urlopen(req, timeout=120) as resp:
+                message = json.loads(resp.read().decode("utf-8"))
+            text = "".join(block.get("text", "") for block in message.get("content", [])
+                           if block.get("type") == "text")
+            match = re.search(r"\[[\s\S]*\]", text)
+            if not match:
+                raise ValueError("No JSON array found in response")
+            return json.loads(match.group(0))
+        except Exception as e:
+            if attempt < retries:
+                print(f"  Retry {attempt + 1}/{retries}: {e}")
+                time.sleep(2 * (attempt + 1))
+            else:
+                raise
+
+
+def compact(session: dict, ref: int) -> dict:
+    return {
+        "ref": ref,
+        "title": session.get("title"),
+        "description": (session.get("description") or "")[:600],
+        "speakers": session.get("speakers") or "Not listed",
+        "knowledge_partners": session.get("knowledge_partners") or "",
+        "session_type": session.get("session_type") or "",
+    }
+
+
+def enrich_batch(endpoint: str, api_key: str, limiter: RateLimiter, batch: list) -> tuple:
+    """Enrich [(hash, session)]; results are matched back by position ref, not event_id.
+
+    Returns (digest -> enrichment for the valid items, number of items rejected).
+    """
+    limiter.acquire()
+    user = f"Enrich these {len(batch)} sessions:\n" + json.dumps(
+        [compact(session, ref) for ref, (_, session) in enumerate(batch)], ensure_ascii=False)
+    results = {}
+    rejected = 0
+    for item in call_model(endpoint, api_key, user):
+        ref = item.get("ref") if isinstance(item, dict) else None
+        if isinstance(ref, int) and 0 <= ref < len(batch) and is_valid_enrichment(item):
+            results[batch[ref][0]] = {field: item[field] for field in ENRICHED_FIELDS}
+        else:
+            rejected += 1
+    return results, rejected
+
+
+def run(sessions: list, endpoint: str, api_key: str, cache: EnrichmentCache,
+        batch_size: int = 10, workers: int = 4, rate: float = 2.0) -> dict:
+    """Enrich sessions in place; returns run statistics."""
+    start = time.perf_counter()
+    hashes = [source_hash(s) for s in sessions]
+
+    misses = {}
+    for digest, session in zip(hashes, sessions):
+        if cache.get(digest) is None and digest not in misses:
+            misses[digest] = session
+    hits = sum(1 for digest in hashes if digest not in misses)
+
+    pending = list(misses.items())
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    limiter = RateLimiter(rate, burst=workers)
+    failed_batches = 0
+    rejected_items = 0
+    enriched_now = 0
+
+    if batches:
+        print(f"Sending {len(pending)} misses in {len(batches)} batches "
+              f"({workers} workers, {rate:g} req/s)")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(enrich_batch, endpoint, api_key, limiter, batch): i
+                   for i, batch in enumerate(batches)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results, rejected = future.result()
+            except Exception as e:
+                failed_batches += 1
+                print(f"  Batch {i + 1}/{len(batches)} FAILED: {e}")
+                continue
+            rejected_items += rejected
+            cache.put_many(results)
+            enriched_now += len(results)
+            print(f"  Batch {i + 1}/{len(batches)} done ({done}/{len(batches)})")
+
+    unenriched = 0
+    for digest, session in zip(hashes, sessions):
+        enrichment = cache.get(digest)
+        if enrichment is None:
+            unenriched += 1
+            continue
+        session.update(enrichment)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "sessions": len(sessions),
+        "cache_hits": hits,
+        "cache_misses": len(sessions) - hits,
+        "hit_rate": hits / len(sessions) if sessions else 0.0,
+        "batches": len(batches),
+        "failed_batches": failed_batches,
+        "rejected_items": rejected_items,
+        "enriched_now": enriched_now,
+        "unenriched": unenriched,
+        "elapsed": elapsed,
+        "throughput": len(sessions) / elapsed if elapsed else 0.0,
+        "miss_throughput": enriched_now / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cached, concurrent session enrichment")
+    parser.add_argument("input", help="sessions JSON (extract_session shape)")
+    parser.add_argument("output", help="where to write enriched sessions")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT)
+    parser.add_argument("--cache", default=DEFAULT_CACHE)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=2.0, help="max requests per second (0 = unlimited)")
+    args = parser.parse_args()
+
+    api_key = load_api_key()
+    if args.endpoint == DEFAULT_ENDPOINT and not api_key:
+        print("Error: set ANTHROPIC_API_KEY or add it to .env (or use --endpoint for a local stand-in)")
+        return
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        sessions = json.load(f)
+
+    print("=" * 70)
+    print("SESSION ENRICHMENT (CACHED)")
+    print("=" * 70)
+    cache = EnrichmentCache(args.cache)
+    print(f"Sessions: {len(sessions)}, cache entries: {len(cache.entries)}, endpoint: {args.endpoint}")
+
+    stats = run(sessions, args.endpoint, api_key, cache, args.batch_size, args.workers, args.rate)
+
+    write_artifact(args.output, sessions)
+
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    print(f"Cache hits: {stats['cache_hits']}/{stats['sessions']} ({stats['hit_rate']:.1%})")
+    print(f"Enriched this run: {stats['enriched_now']} in {stats['batches']} batches "
+          f"({stats['failed_batches']} failed, {stats['rejected_items']} malformed items not cached)")
+    print(f"Not enriched: {stats['unenriched']}")
+    print(f"Elapsed: {stats['elapsed']:.2f}s -> {stats['throughput']:.1f} sessions/s "
+          f"({stats['miss_throughput']:.1f} model-enriched/s)")
+    print(f"✓ Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Local Stand-In for the Messages API
+Answers POST /v1/messages with deterministic enrichment built from the
+request itself, so enrich_sessions.py can be run and timed without an API
+key or network access.
+
+Usage:
+    python mock_llm_server.py [--port 8780] [--latency 0.2] [--fail-rate 0]
+    python enrich_sessions.py in.json out.json --endpoint http://127.0.0.1:8780/v1/messages
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_enrichment(item: dict) -> dict:
+    title = item.get("title") or ""
+    seed = int(hashlib.sha256(title.encode("utf-8")).hexdigest()[:8], 16)
+    words = [w.lower() for w in re.findall(r"[A-Za-z]{4,}", title)]
+    return {
+        "ref": item.get("ref"),
+        "summary_one_liner": title[:80],
+        "technical_depth": seed % 5 + 1,
+        "target_personas": ["AI Researchers", "Policy Makers", "Startup Founders"][: seed % 3 + 1],
+        "keywords": list(dict.fromkeys(words))[:5] or ["ai"],
+        "networking_signals": {
+            "is_heavy_hitter": seed % 17 == 0,
+            "decision_maker_density": ["Low", "Medium", "High"][seed % 3],
+            "investor_presence": ["Unlikely", "Possible", "Likely"][seed % 3],
+        },
+    }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_rate = 0.0
+    calls = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/messages":
+            self.send_error(404)
+            return
+        with MockHandler.lock:
+            MockHandler.calls += 1
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length).decode("utf-8"))
+        time.sleep(self.latency)
+
+        if random.random() < self.fail_rate:
+            self.send_error(529, "Overloaded")
+            return
+
+        user = request["messages"][-1]["content"]
+        match = re.search(r"\[[\s\S]*\]", user)
+        items = json.loads(match.group(0)) if match else []
+        text = json.dumps([fake_enrichment(item) for item in items], ensure_ascii=False)
+        body = json.dumps({
+            "id": f"msg_mock_{MockHandler.calls}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start(port: int = 0, latency: float = 0.0, fail_rate: float = 0.0) -> ThreadingHTTPServer:
+    """Start the stand-in on a background thread; port 0 picks a free one."""
+    MockHandler.latency = latency
+    MockHandler.fail_rate = fail_rate
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Messages API")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered 529")
+    args = parser.parse_args()
+
+    server = start(args.port, args.latency, args.fail_rate)
+    print(f"Mock Messages API on http://127.0.0.1:{server.server_address[1]}/v1/messages "
+          f"(latency {args.latency}s, fail rate {args.fail_rate:.0%})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Canonical Artifact Writer
+One way for every Python stage to write its JSON outputs:
+  - canonical bytes: sorted keys, compact separators, top-level arrays
+    ordered by id (stable, so repeated ids keep their order), one record
+    per line so diffs stay readable
+  - streamed to disk in blocks, so large arrays are never held as one string
+  - atomic: temp file + rename, for the JSON and its variants
+  - <file>.sha256 (sha256sum format) and <file>.gz next to every file
+  - artifacts.json in the directory listing each artifact's size,
+    gzip size, checksum and record count
+
+Caches can key on the checksum without reading the file, and the web
+bundle can ship the .gz as is.
+
+Usage:
+    python artifacts.py write input.json [output.json]   # canonicalize an existing file
+    python artifacts.py verify <dir or file> [...]
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from snapshot_store import atomic_write, file_mode
+
+MANIFEST_NAME = "artifacts.json"
+BLOCK_SIZE = 1 << 20
+
+
+def canonical_dumps(value) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def _id_order(sort_by: str):
+    """Sort key for records: numbers, then strings, then missing ids."""
+    def key(record):
+        value = record.get(sort_by) if isinstance(record, dict) else None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (0, value, "")
+        if value is None:
+            return (2, 0, "")
+        return (1, 0, str(value))
+    return key
+
+
+def _is_array(data) -> bool:
+    return data is not None and not isinstance(data, (dict, str, int, float, bool))
+
+
+def _chunks(data, sort_by, stats: dict):
+    """Canonical text of `data` in pieces; arrays go out one record per line."""
+    if not _is_array(data):
+        yield canonical_dumps(data) + "\n"
+        return
+    records = sorted(data, key=_id_order(sort_by)) if sort_by else data
+    yield "["
+    for record in records:
+        yield ("\n" if stats["records"] == 0 else ",\n") + canonical_dumps(record)
+        stats["records"] += 1
+    yield "\n]\n" if stats["records"] else "]\n"
+
+
+class _AtomicStream:
+    """Binary temp file in the target's directory, renamed into place by commit()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        os.chmod(self.tmp_path, file_mode(path))
+        self.file = os.fdopen(fd, "wb")
+
+    def commit(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def write_artifact(path: str, data, sort_by: str = "id", compress: bool = True,
+                   manifest: bool = True) -> dict:
+    """Write `data` canonically with its .sha256 (and .gz) and record it in the manifest.
+
+    `data` may be any JSON value or an iterable of records; pass sort_by=None
+    to keep the caller's order (and to stream a generator without
+    materializing it). Returns the artifact's manifest entry.
+    """
+    hasher = hashlib.sha256()
+    stats = {"records": 0, "bytes": 0}
+    out = _AtomicStream(path)
+    gz_out = _AtomicStream(path + ".gz") if compress else None
+    gz = gzip.GzipFile(filename="", fileobj=gz_out.file, mode="wb", compresslevel=9, mtime=0) if compress else None
+
+    def emit(pieces: list):
+        block = "".join(pieces).encode("utf-8")
+        out.file.write(block)
+        hasher.update(block)
+        stats["bytes"] += len(block)
+        if gz:
+            gz.write(block)
+
+    try:
+        buffer = []
+        buffered = 0
+        for piece in _chunks(data, sort_by, stats):
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= BLOCK_SIZE:
+                emit(buffer)
+                buffer, buffered = [], 0
+        emit(buffer)
+        if gz:
+            gz.close()
+    except BaseException:
+        out.abort()
+        if gz_out:
+            gz_out.abort()
+        raise
+
+    out.commit()
+    entry = {
+        "bytes": stats["bytes"],
+        "sha256": hasher.hexdigest(),
+        "records": stats["records"] if _is_array(data) else None,
+        "written_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    if gz_out:
+        gz_out.commit()
+        entry["gzip_bytes"] = os.path.getsize(path + ".gz")
+    atomic_write(path + ".sha256", f"{entry['sha256']}  {os.path.basename(path)}\n".encode("utf-8"))
+    if manifest:
+        update_manifest(os.path.dirname(path) or ".", os.path.basename(path), entry)
+    return entry
+
+
+def update_manifest(directory: str, name: str, entry: dict):
+    path = os.path.join(directory, MANIFEST_NAME)
+    manifest = {"artifacts": {}}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    manifest["artifacts"][name] = entry
+    manifest["artifacts"] = dict(sorted(manifest["artifacts"].items()))
+    manifest["updated_at"] = entry["written_at"]
+    atomic_write(path, (json.dumps(manifest, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def read_checksum(path: str):
+    """The sha256 recorded next to `path`, without reading the artifact."""
+    try:
+        with open(path + ".sha256", "r", encoding="utf-8") as f:
+            return f.read().split()[0]
+    except (OSError, IndexError):
+        return None
+
+
+def verify_artifact(path: str) -> bool:
+    expected = read_checksum(path)
+    if expected is None:
+        return False
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest() == expected
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ("write", "verify"):
+        print(__doc__)
+        return 1
+
+    if args[0] == "write":
+        if len(args) < 2:
+            print("Usage: python artifacts.py write input.json [output.json]")
+            return 1
+        source = args[1]
+        target = args[2] if len(args) > 2 else source
+        before = os.path.getsize(source)
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entry = write_artifact(target, data)
+        print(f"✓ {target}: {before:,} -> {entry['bytes']:,} bytes "
+              f"({entry.get('gzip_bytes', 0):,} gzipped), sha256 {entry['sha256'][:12]}")
+        return 0
+
+    failed = 0
+    for target in args[1:]:
+        if os.path.isdir(target):
+            with open(os.path.join(target, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                paths = [os.path.join(target, name) for name in json.load(f)["artifacts"]]
+        else:
+            paths = [target]
+        for path in paths:
+            ok = os.path.exists(path) and verify_artifact(path)
+            failed += not ok
+            print(f"  {'✓' if ok else '✗'} {path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,8 @@ Shows what WOULD be deleted without actually deleting anything
 import json
 from collections import defaultdict
 
+from session_diff import diff_records
+
 print("=" * 70)
 print("DEDUPE DRY RUN v2 - Using 'id' field (NO FILES MODIFIED)")
 print("=" * 70)
@@ -104,14 +106,9 @@ for i, dup in enumerate(would_delete[:2]):
         print(f"  Summary: {kept_session.get('summary_one_liner')}")
         print(f"  Is Heavy Hitter: {kept_session.get('networking_signals', {}).get('is_heavy_hitter')}")
 
-        # Are they actually identical?
-        identical = (
-            kept_session.get('title') == dup_session.get('title') and
-            kept_session.get('date') == dup_session.get('date') and
-            kept_session.get('start_time') == dup_session.get('start_time') and
-            kept_session.get('speakers') == dup_session.get('speakers') and
-            kept_session.get('description') == dup_session.get('description')
-        )
+        # Are they actually identical? (full structural diff, not a field subset)
+        differences = diff_records(kept_session, dup_session)
+        identical = not differences
 
         print(f"\n{'='*70}")
         print(f"COMPARISON:")
@@ -121,12 +118,8 @@ for i, dup in enumerate(would_delete[:2]):
         if not identical:
             print(f"  🚨 WARNING: These have the same ID but different content!")
             print(f"\n  Differences:")
-            if kept_session.get('title') != dup_session.get('title'):
-                print(f"    - Title differs")
-            if kept_session.get('date') != dup_session.get('date'):
-                print(f"    - Date differs")
-            if kept_session.get('speakers') != dup_session.get('speakers'):
-                print(f"    - Speakers differ")
+            for path in differences:
+                print(f"    - {path} differs")
         else:
             print(f"  ✅ These are exact duplicates - safe to delete")
 
@@ -5,20 +5,20 @@ Keeps first occurrence, removes duplicates
 """
 
 import json
-import shutil
-from datetime import datetime
+
+from artifacts import write_artifact
+from snapshot_store import SnapshotStore
+from validate_data import gate
 
 print("=" * 70)
 print("RUNNING DEDUPLICATION")
 print("=" * 70)
 
 # Create backup first
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-backup_file = f'sessions_enriched_backup_{timestamp}.json'
-
 print(f"\n1. Creating backup...")
-shutil.copy('sessions_enriched.json', backup_file)
-print(f"   ✓ Backup saved: {backup_file}")
+snapshot = SnapshotStore().snapshot_file('sessions_enriched.json', label='pre-dedupe')
+backup_file = snapshot['version']
+print(f"   ✓ Snapshot saved: {backup_file} ({snapshot['new_blobs']} new records stored)")
 
 # Load original data
 print(f"\n2. Loading original data...")
@@ -62,8 +62,8 @@ print(f"   ✓ Heavy hitters in clean data: {hh_count}")
 # Save clean data
 output_file = 'sessions_enriched_clean.json'
 print(f"\n6. Saving clean data...")
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(clean_sessions, f, indent=2, ensure_ascii=False)
+gate(clean_sessions, 'enriched_clean', output_file)
+write_artifact(output_file, clean_sessions)
 print(f"   ✓ Saved to: {output_file}")
 
 # Summary
@@ -75,6 +75,6 @@ print(f"Clean: {len(clean_sessions)} sessions")
 print(f"Removed: {len(removed)} duplicates")
 print(f"Heavy hitters: {hh_count}")
 print(f"\nFiles:")
-print(f"  - Original backup: {backup_file}")
+print(f"  - Original snapshot: {backup_file} (restore with snapshot_store.py restore)")
 print(f"  - Clean data: {output_file}")
 print("=" * 70)
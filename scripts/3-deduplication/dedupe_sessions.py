@@ -4,6 +4,11 @@ Removes duplicate event_ids, keeping first occurrence
 """
 
 import json
+from collections import Counter
+
+from artifacts import write_artifact
+from snapshot_store import SnapshotStore
+from validate_data import gate
 
 print("=" * 70)
 print("DEDUPLICATING SESSIONS")
@@ -30,8 +35,8 @@ for session in sessions:
     event_id = session.get('event_id')
     id_num = session.get('id')
 
-    # Check if we've seen this event_id before
-    if event_id in seen_event_ids:
+    # Check if we've seen this event_id before (some sessions have none)
+    if event_id is not None and event_id in seen_event_ids:
         removed.append({
             'id': id_num,
             'event_id': event_id,
@@ -61,10 +66,10 @@ print(f"\nFinal count: {len(clean_sessions)} sessions")
 print(f"Reduction: {len(sessions) - len(clean_sessions)} sessions removed")
 
 # Verify all known duplicates were handled
-remaining_ids = [s['id'] for s in clean_sessions]
+remaining_ids = Counter(s['id'] for s in clean_sessions)
 still_duplicated = []
 for dup_id in known_duplicates:
-    count = remaining_ids.count(dup_id)
+    count = remaining_ids[dup_id]
     if count > 1:
         still_duplicated.append((dup_id, count))
 
@@ -80,15 +85,14 @@ hh_count = sum(1 for s in clean_sessions if s['networking_signals']['is_heavy_hi
 print(f"\nHeavy hitters in clean data: {hh_count}")
 
 # Save clean data
-with open('sessions_enriched_clean.json', 'w', encoding='utf-8') as f:
-    json.dump(clean_sessions, f, indent=2, ensure_ascii=False)
+gate(clean_sessions, 'enriched_clean', 'sessions_enriched_clean.json')
+write_artifact('sessions_enriched_clean.json', clean_sessions)
 
 print(f"\n✓ Saved to: sessions_enriched_clean.json")
 
 # Backup original
-import shutil
-shutil.copy('sessions_enriched.json', 'sessions_enriched_backup.json')
-print(f"✓ Backed up original to: sessions_enriched_backup.json")
+snapshot = SnapshotStore().snapshot_file('sessions_enriched.json', label='pre-dedupe')
+print(f"✓ Snapshot of original: {snapshot['version']} ({snapshot['new_blobs']} new records stored)")
 
 print("\n" + "=" * 70)
 print("DEDUPE COMPLETE")
@@ -4,7 +4,11 @@ Includes both Plenary Hall keynotes and key panel discussions
 """
 
 import json
-from collections import defaultdict
+from collections import Counter, defaultdict
+
+from artifacts import write_artifact
+from snapshot_store import SnapshotStore
+from validate_data import gate
 
 # Load data
 with open('sessions_enriched.json', 'r', encoding='utf-8') as f:
@@ -207,7 +211,7 @@ for date in sorted(by_date.keys()):
 print(f"\nStep 8: Checking for duplicate IDs...")
 all_ids = [s['id'] for s in sessions]
 hh_ids = [s['id'] for s in heavy_hitters]
-duplicate_ids = [id for id in set(hh_ids) if hh_ids.count(id) > 1]
+duplicate_ids = [id for id, count in Counter(hh_ids).items() if count > 1]
 
 if duplicate_ids:
     print(f"  ⚠️  WARNING: Duplicate heavy hitter IDs found: {duplicate_ids}")
@@ -226,8 +230,10 @@ elif len(heavy_hitters) > target_count + 5:
 
 # Step 11: Save updated data
 print(f"\nStep 9: Saving updated data...")
-with open('sessions_enriched.json', 'w', encoding='utf-8') as f:
-    json.dump(sessions, f, indent=2, ensure_ascii=False)
+gate(sessions, 'enriched', 'sessions_enriched.json')
+snapshot = SnapshotStore().snapshot_file('sessions_enriched.json', label='pre-heavy-hitters')
+print(f"  ✓ Snapshot of previous file: {snapshot['version']}")
+write_artifact('sessions_enriched.json', sessions)
 
 final_count = len(heavy_hitters)
 unique_count = len(set(hh_ids))
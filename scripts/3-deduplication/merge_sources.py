@@ -0,0 +1,508 @@
+"""
+Multi-Source Session Merge
+Merges the CMS API scrape (data/raw/sessions.json), the official site scrape
+(data/raw/official_site_scraped.json) and the XLSX export
+(data/raw/xlsx_parsed.json) into one session list in the extract_session
+shape, plus a source map recording where every merged record and field
+came from.
+
+Matching uses the same signals as data/analysis/merge_v2_smart.js (title
+Jaccard, title prefix, same time, same room, speaker surnames), but pairs
+are only scored inside blocks:
+  - (date, HH:MM start, normalized room)
+  - (date, normalized title)
+  - (date, title token), skipping tokens too common to discriminate
+so the work grows with block sizes instead of n x m.
+
+Usage:
+    python merge_sources.py [--output FILE] [--source-map FILE]
+    python merge_sources.py --cms a.json --official b.json --xlsx c.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from artifacts import write_artifact
+from validate_data import gate
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+CMS_PATH = os.path.join(DATA_DIR, "raw", "sessions.json")
+OFFICIAL_PATH = os.path.join(DATA_DIR, "raw", "official_site_scraped.json")
+XLSX_PATH = os.path.join(DATA_DIR, "raw", "xlsx_parsed.json")
+OUTPUT_PATH = os.path.join(DATA_DIR, "raw", "sessions_merged.json")
+SOURCE_MAP_PATH = os.path.join(DATA_DIR, "analysis", "sessions_merge_source_map.json")
+
+# Merge order: the first source seeds the clusters, later ones are matched into them
+SOURCES = ("cms", "official", "xlsx")
+
+# First non-empty value wins, in this order
+FIELD_PRECEDENCE = {
+    "title": ("official", "cms", "xlsx"),
+    "description": ("official", "cms", "xlsx"),
+    "date": ("official", "cms", "xlsx"),
+    "start_time": ("official", "cms", "xlsx"),
+    "end_time": ("official", "cms", "xlsx"),
+    "venue": ("official", "cms", "xlsx"),
+    "room": ("official", "cms", "xlsx"),
+    "speakers": ("official", "cms", "xlsx"),
+    "knowledge_partners": ("official", "cms", "xlsx"),
+    "session_type": ("cms",),
+    "add_to_calendar": ("cms",),
+    "notes": ("cms",),
+}
+
+DEFAULT_SESSION_TYPE = "Main Summit Session"
+MATCH_SCORE = 5
+LOW_CONFIDENCE_SCORE = 3
+
+# A title token shared by more sessions than this on one day says nothing
+# about identity ("india", "future", ...) and would turn its block into n x m
+MAX_TOKEN_BLOCK = 50
+
+EXCEL_EPOCH = date(1899, 12, 30)
+
+
+# ─── NORMALIZATION ────────────────────────────────────────
+
+def norm(text) -> str:
+    """Lowercase, alphanumerics and single spaces only (norm() in merge_v2_smart.js)."""
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9 ]", "", str(text or "").lower())).strip()
+
+
+def norm_time(value):
+    """'09:30:00.000' / '9:30 AM' -> '09:30'."""
+    match = re.search(r"(\d{1,2}):(\d{2})", str(value or ""))
+    return f"{int(match.group(1)):02d}:{match.group(2)}" if match else None
+
+
+def title_tokens(normalized_title: str) -> frozenset:
+    return frozenset(w for w in normalized_title.split(" ") if len(w) > 2)
+
+
+def speaker_surnames(speakers: list) -> set:
+    """Rough last names, as in merge_v2_smart.js: split on ; and , and keep the last word."""
+    names = set()
+    for speaker in speakers:
+        for part in re.split(r"[;,]", speaker.lower()):
+            words = part.split()
+            if words and len(words[-1]) > 3:
+                names.add(words[-1])
+    return names
+
+
+def _split_list(value) -> list:
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if v and str(v).strip()]
+    return [v.strip() for v in str(value or "").split(";") if v.strip()]
+
+
+def _record(source: str, key, raw: dict, **fields) -> dict:
+    """Common shape for records of every source, with precomputed match keys."""
+    record = {
+        "source": source,
+        "key": key,
+        "raw": raw,
+        "title": fields.get("title") or "",
+        "description": fields.get("description") or None,
+        "date": fields.get("date"),
+        "start_time": fields.get("start_time"),
+        "end_time": fields.get("end_time"),
+        "venue": fields.get("venue") or None,
+        "room": fields.get("room") or None,
+        "speakers": _split_list(fields.get("speakers")),
+        "knowledge_partners": _split_list(fields.get("knowledge_partners")),
+    }
+    record["n_title"] = norm(record["title"])
+    record["n_time"] = norm_time(record["start_time"])
+    record["n_room"] = norm(record["room"])
+    record["tokens"] = title_tokens(record["n_title"])
+    record["surnames"] = speaker_surnames(record["speakers"])
+    return record
+
+
+# ─── SOURCE LOADERS ───────────────────────────────────────
+
+def load_cms(path: str = CMS_PATH) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        sessions = json.load(f)
+    return [_record("cms", s.get("id"), s, **s) for s in sessions]
+
+
+def load_official(path: str = OFFICIAL_PATH) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        sessions = json.load(f)
+    return [_record("official", s.get("official_id"), s, **s) for s in sessions]
+
+
+def excel_date(value, fallback=None):
+    """Excel serial day (46069) -> '2026-02-16'; ISO strings pass through."""
+    if isinstance(value, (int, float)):
+        return (EXCEL_EPOCH + timedelta(days=int(value))).isoformat()
+    if isinstance(value, str) and re.match(r"\d{4}-\d{2}-\d{2}", value):
+        return value[:10]
+    return fallback
+
+
+def excel_time_range(value) -> tuple:
+    """'9:30 AM - 10:30 AM' or a day fraction (0.3958) -> ('09:30:00.000', '10:30:00.000')."""
+    if isinstance(value, (int, float)):
+        minutes = round(value * 24 * 60)
+        return f"{minutes // 60:02d}:{minutes % 60:02d}:00.000", None
+    times = re.findall(r"(\d{1,2}):(\d{2})\s*(AM|PM)?", str(value or ""), re.IGNORECASE)
+    result = []
+    for i, (hours, minutes, meridiem) in enumerate(times[:2]):
+        # "9:30 - 10:30 AM": borrow the end time's AM/PM
+        meridiem = (meridiem or (times[1][2] if i == 0 and len(times) > 1 else "")).upper()
+        hours = int(hours) % 12 + (12 if meridiem == "PM" else 0) if meridiem else int(hours)
+        result.append(f"{hours:02d}:{minutes}:00.000")
+    result += [None] * (2 - len(result))
+    return tuple(result)
+
+
+def _sheet_date(sheet_name: str):
+    """'Day 16' / 'day20' -> '2026-02-16' when a row has no Date cell."""
+    match = re.match(r"\s*day\s*(\d{1,2})\s*$", sheet_name, re.IGNORECASE)
+    return f"2026-02-{int(match.group(1)):02d}" if match else None
+
+
+def load_xlsx(path: str = XLSX_PATH) -> list:
+    """Session rows of the Day sheets; 'Founders Name' and header rows are skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        sheets = json.load(f)
+
+    records = []
+    for sheet_name, rows in sheets.items():
+        sheet_date = _sheet_date(sheet_name)
+        if sheet_date is None:
+            continue
+        for row in rows:
+            title = str(row.get("Title") or "").strip()
+            if not title or title == "Title":
+                continue
+            speakers = [str(v).strip() for k, v in row.items()
+                        if re.fullmatch(r"[Nn]ame(_\d+)?", k) and v and str(v).strip()]
+
+            # Description cells run: "Description", text..., "Knowledge Partners", partner...
+            description, partners, target = [], [], None
+            for k in sorted((k for k in row if k.startswith("Description")),
+                            key=lambda k: int(k.partition("_")[2] or 0)):
+                value = str(row[k] or "").strip()
+                if not value or value == "Description" or value.startswith("http"):
+                    continue
+                if value == "Knowledge Partners":
+                    target = partners
+                    continue
+                (target if target is not None else description).append(value)
+
+            start_time, end_time = excel_time_range(row.get("Time"))
+            records.append(_record(
+                "xlsx", f"xlsx_{len(records) + 1}", row,
+                title=title,
+                description=" ".join(description),
+                date=excel_date(row.get("Date"), sheet_date),
+                start_time=start_time,
+                end_time=end_time,
+                venue=str(row.get("Location") or "").strip(),
+                room=str(row.get("ROom") or "").strip(),
+                speakers=speakers,
+                knowledge_partners=partners,
+            ))
+    return records
+
+
+# ─── MATCHING ─────────────────────────────────────────────
+
+def score_pair(a: dict, b: dict) -> tuple:
+    """(score, signals) with merge_v2_smart.js weights, or (0, []) if there is no
+    title signal and no same-time-and-room context."""
+    score = 0
+    signals = []
+
+    jaccard = 0.0
+    if a["tokens"] and b["tokens"]:
+        jaccard = len(a["tokens"] & b["tokens"]) / len(a["tokens"] | b["tokens"])
+    if a["n_title"] and a["n_title"] == b["n_title"]:
+        score += 10
+        signals.append("exact_title")
+    elif jaccard >= 0.6:
+        score += 7
+        signals.append(f"title_sim_{jaccard:.2f}")
+    elif jaccard >= 0.4:
+        score += 4
+        signals.append(f"title_partial_{jaccard:.2f}")
+    elif jaccard >= 0.25:
+        score += 2
+        signals.append(f"title_weak_{jaccard:.2f}")
+
+    prefix_a, prefix_b = a["n_title"][:40], b["n_title"][:40]
+    prefix = len(prefix_a) > 10 and (prefix_a in b["n_title"] or prefix_b in a["n_title"])
+    if prefix:
+        score += 3
+        signals.append("substr")
+
+    same_time = a["n_time"] is not None and a["n_time"] == b["n_time"]
+    same_room = bool(a["n_room"]) and a["n_room"] == b["n_room"]
+    if same_time:
+        score += 2
+        signals.append("same_time")
+    if same_room:
+        score += 3
+        signals.append("same_room")
+
+    overlap = len(a["surnames"] & b["surnames"])
+    if overlap >= 2:
+        score += 4
+        signals.append(f"speakers_{overlap}")
+    elif overlap == 1:
+        score += 2
+        signals.append("speaker_1")
+
+    if jaccard >= 0.25 or prefix or (same_time and same_room):
+        return score, signals
+    return 0, []
+
+
+class BlockingIndex:
+    """Cluster ids by (date, slot), (date, title) and (date, title token)."""
+
+    def __init__(self, max_token_block: int = MAX_TOKEN_BLOCK):
+        self.max_token_block = max_token_block
+        self.slots = defaultdict(list)
+        self.titles = defaultdict(list)
+        self.tokens = defaultdict(list)
+
+    def add(self, cluster_id: int, record: dict):
+        day = record["date"]
+        if record["n_time"] and record["n_room"]:
+            self.slots[(day, record["n_time"], record["n_room"])].append(cluster_id)
+        if record["n_title"]:
+            self.titles[(day, record["n_title"])].append(cluster_id)
+        for token in record["tokens"]:
+            self.tokens[(day, token)].append(cluster_id)
+
+    def candidates(self, record: dict) -> set:
+        day = record["date"]
+        found = set(self.slots.get((day, record["n_time"], record["n_room"]), ()))
+        found.update(self.titles.get((day, record["n_title"]), ()))
+        for token in record["tokens"]:
+            block = self.tokens.get((day, token))
+            if block and len(block) <= self.max_token_block:
+                found.update(block)
+        return found
+
+
+def merge(sources: dict, max_token_block: int = MAX_TOKEN_BLOCK) -> tuple:
+    """Cluster records of all sources; returns (clusters, stats).
+
+    Each cluster is {source: record}. Records of the first source seed the
+    clusters (repeated keys collapse into the first occurrence); every later
+    source is matched one-to-one against existing clusters, highest score
+    first, and its unmatched records start new clusters.
+    """
+    clusters = []
+    matches = []
+    index = BlockingIndex(max_token_block)
+    stats = {"candidate_pairs": 0, "duplicate_keys": defaultdict(int)}
+
+    for source in SOURCES:
+        records = sources.get(source) or []
+        seen_keys = set()
+        unique = []
+        for record in records:
+            if record["key"] is not None and record["key"] in seen_keys:
+                stats["duplicate_keys"][source] += 1
+                continue
+            seen_keys.add(record["key"])
+            unique.append(record)
+
+        pairs = []
+        for i, record in enumerate(unique):
+            for cluster_id in index.candidates(record):
+                if source in clusters[cluster_id]:
+                    continue
+                stats["candidate_pairs"] += 1
+                score, signals = max((score_pair(record, member) for member in clusters[cluster_id].values()),
+                                     key=lambda result: result[0])
+                if score >= LOW_CONFIDENCE_SCORE:
+                    pairs.append((-score, i, cluster_id, signals))
+        pairs.sort(key=lambda pair: pair[:3])
+
+        matched_records = set()
+        for neg_score, i, cluster_id, signals in pairs:
+            if i in matched_records or source in clusters[cluster_id]:
+                continue
+            matched_records.add(i)
+            clusters[cluster_id][source] = unique[i]
+            index.add(cluster_id, unique[i])
+            matches.append({
+                "cluster": cluster_id,
+                "source": source,
+                "score": -neg_score,
+                "confidence": "high" if -neg_score >= MATCH_SCORE else "low",
+                "signals": signals,
+            })
+
+        for i, record in enumerate(unique):
+            if i not in matched_records:
+                clusters.append({source: record})
+                index.add(len(clusters) - 1, record)
+
+    stats["duplicate_keys"] = dict(stats["duplicate_keys"])
+    stats["matches"] = matches
+    return clusters, stats
+
+
+# ─── OUTPUT ───────────────────────────────────────────────
+
+def new_event_id(record: dict) -> str:
+    """Stable 24-hex event_id for sessions the CMS has none for."""
+    return hashlib.sha256(f"{record['source']}:{record['key']}".encode("utf-8")).hexdigest()[:24]
+
+
+def _field_value(record: dict, field: str):
+    if field in ("session_type", "add_to_calendar", "notes"):
+        return record["raw"].get(field)
+    value = record[field]
+    if isinstance(value, list):
+        return "; ".join(value)
+    return value
+
+
+def build_merged(clusters: list, stats: dict) -> tuple:
+    """(merged sessions, source map) from merge() output."""
+    next_id = max((c["cms"]["key"] for c in clusters if isinstance(c.get("cms", {}).get("key"), int)),
+                  default=0) + 1
+    match_info = defaultdict(dict)
+    for match in stats["matches"]:
+        match_info[match["cluster"]][match["source"]] = {
+            "score": match["score"], "confidence": match["confidence"], "signals": match["signals"]}
+
+    merged = []
+    details = {}
+    provenance = {}
+    summary = defaultdict(int)
+    for cluster_id, cluster in enumerate(clusters):
+        session = {}
+        field_sources = {}
+        for field, precedence in FIELD_PRECEDENCE.items():
+            session[field] = None
+            for source in precedence:
+                if source in cluster:
+                    value = _field_value(cluster[source], field)
+                    if value not in (None, ""):
+                        session[field] = value
+                        field_sources[field] = source
+                        break
+
+        cms = cluster.get("cms")
+        if cms:
+            session_id, event_id = cms["key"], cms["raw"].get("event_id") or new_event_id(cms)
+        else:
+            origin = cluster.get("official") or cluster["xlsx"]
+            session_id, event_id = next_id, new_event_id(origin)
+            next_id += 1
+        session["session_type"] = session["session_type"] or DEFAULT_SESSION_TYPE
+        if session["add_to_calendar"] is None:
+            session["add_to_calendar"] = True
+        session["speakers"] = session["speakers"] or ""
+        session["knowledge_partners"] = session["knowledge_partners"] or ""
+
+        merged.append({
+            "id": session_id,
+            "title": session["title"],
+            "description": session["description"],
+            "date": session["date"],
+            "start_time": session["start_time"],
+            "end_time": session["end_time"],
+            "venue": session["venue"],
+            "room": session["room"],
+            "speakers": session["speakers"],
+            "knowledge_partners": session["knowledge_partners"],
+            "session_type": session["session_type"],
+            "event_id": event_id,
+            "add_to_calendar": session["add_to_calendar"],
+            "notes": session["notes"],
+        })
+
+        if len(cluster) > 1:
+            status = "matched"
+        elif cms:
+            status = "cms_only"
+        else:
+            status = f"new_{next(iter(cluster))}"
+        summary[status] += 1
+        # Keyed by id: the CMS has given one event_id to two sessions
+        details[str(session_id)] = status
+        provenance[str(session_id)] = {
+            "event_id": event_id,
+            "sources": {source: record["key"] for source, record in cluster.items()},
+            "matches": match_info.get(cluster_id, {}),
+            "fields": field_sources,
+        }
+
+    merged.sort(key=lambda s: (s["date"] or "", s["start_time"] or "", str(s["id"])))
+    source_map = {
+        "summary": dict(summary),
+        "details": details,
+        "provenance": provenance,
+    }
+    return merged, source_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge CMS, official site and XLSX session sources")
+    parser.add_argument("--cms", default=CMS_PATH)
+    parser.add_argument("--official", default=OFFICIAL_PATH)
+    parser.add_argument("--xlsx", default=XLSX_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH, help="merged sessions JSON")
+    parser.add_argument("--source-map", default=SOURCE_MAP_PATH, help="where each record and field came from")
+    parser.add_argument("--max-token-block", type=int, default=MAX_TOKEN_BLOCK,
+                        help="ignore title tokens shared by more sessions than this on one day")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("MULTI-SOURCE SESSION MERGE")
+    print("=" * 70)
+    start = time.perf_counter()
+    sources = {
+        "cms": load_cms(args.cms),
+        "official": load_official(args.official),
+        "xlsx": load_xlsx(args.xlsx),
+    }
+    for source in SOURCES:
+        print(f"  {source:<9} {len(sources[source]):6d} records")
+    loaded = time.perf_counter()
+
+    clusters, stats = merge(sources, args.max_token_block)
+    merged, source_map = build_merged(clusters, stats)
+    elapsed = time.perf_counter() - loaded
+
+    gate(merged, "sessions", os.path.basename(args.output))
+    # Schedule order from build_merged, like the CMS scrape it stands in for
+    write_artifact(args.output, merged, sort_by=None)
+    write_artifact(args.source_map, source_map)
+
+    total = sum(len(records) for records in sources.values())
+    naive = len(sources["cms"]) * len(sources["official"]) + \
+        (len(sources["cms"]) + len(sources["official"])) * len(sources["xlsx"])
+    low = sum(1 for m in stats["matches"] if m["confidence"] == "low")
+    print(f"\nCandidate pairs scored: {stats['candidate_pairs']:,} (all-pairs would be ~{naive:,})")
+    print(f"Matches: {len(stats['matches'])} ({low} low confidence)")
+    for source, count in stats["duplicate_keys"].items():
+        print(f"  ⚠️  {count} repeated {source} keys collapsed into their first record")
+    for status, count in sorted(source_map["summary"].items()):
+        print(f"  {status:<13} {count:6d}")
+    print(f"\nMerged {total:,} records into {len(merged):,} sessions in {elapsed:.2f}s "
+          f"(+{loaded - start:.2f}s loading)")
+    print(f"✓ Saved: {args.output}")
+    print(f"✓ Source map: {args.source_map}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Keyed Structural Diff for Session Snapshots
+Aligns two session collections by a key (id, event_id or a composite such
+as date+start_time+room) with a hash join and reports field-level changes,
+including nested networking_signals and list fields like keywords.
+
+Unchanged records are skipped with a single equality (or stored hash)
+check, so only records that actually differ are walked field by field.
+
+Usage:
+    python session_diff.py old.json new.json [--key id] [--output changes.json]
+    python session_diff.py old.json new.json --key date,start_time,room
+    python session_diff.py --versions <version_a> <version_b>   # snapshot_store versions
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import Counter
+
+from snapshot_store import SnapshotStore
+
+MISSING = "<missing>"
+
+
+def key_function(key: str):
+    """'id' -> record['id']; 'date,start_time,room' -> composite tuple."""
+    fields = [f.strip() for f in key.split(",") if f.strip()]
+    if not fields:
+        raise ValueError("Empty diff key")
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda record: record.get(field)
+    return lambda record: tuple(record.get(f) for f in fields)
+
+
+def record_digest(record: dict) -> str:
+    data = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def collection_hashes(records: list, key: str = "id") -> dict:
+    """key -> digest for a collection; cache it next to a snapshot to skip re-hashing."""
+    return {k: record_digest(r) for k, r in _index(records, key_function(key)).items()}
+
+
+def _hashable(value):
+    """Stable hashable form of a list element (keywords may be dicts)."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return value
+
+
+def _multiset_minus(values: list, other: list) -> list:
+    """Elements of `values` not matched one-for-one by elements of `other`."""
+    available = Counter(_hashable(v) for v in other)
+    result = []
+    for v in values:
+        k = _hashable(v)
+        if available[k]:
+            available[k] -= 1
+        else:
+            result.append(v)
+    return result
+
+
+def diff_values(old, new, path: str, changes: dict):
+    """Recursively record differences between two values under `path`."""
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for field in sorted(set(old) | set(new), key=str):
+            diff_values(old.get(field, MISSING), new.get(field, MISSING),
+                        f"{path}.{field}" if path else field, changes)
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        added = _multiset_minus(new, old)
+        removed = _multiset_minus(old, new)
+        if added or removed:
+            changes[path] = {"added": added, "removed": removed}
+        else:
+            changes[path] = {"reordered": True, "old": old, "new": new}
+        return
+    changes[path] = {"old": old, "new": new}
+
+
+def diff_records(old: dict, new: dict) -> dict:
+    """{field path: change} for two records; empty when identical."""
+    changes = {}
+    diff_values(old, new, "", changes)
+    return changes
+
+
+def _index(records: list, key_fn) -> dict:
+    """Hash-join side: key -> record, with (key, n) for repeated keys."""
+    index = {}
+    seen = {}
+    for record in records:
+        key = key_fn(record)
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        index[key if n == 0 else (key, n)] = record
+    return index
+
+
+def _diff_indexes(old_index: dict, new_index: dict, key: str, is_same) -> dict:
+    added = []
+    changed = []
+    unchanged = 0
+    for k, new in new_index.items():
+        if k not in old_index:
+            added.append({"key": k, "record": new})
+        elif is_same(k):
+            unchanged += 1
+        else:
+            changed.append({"key": k, "fields": diff_records(old_index[k], new)})
+    removed = [{"key": k, "record": old} for k, old in old_index.items() if k not in new_index]
+
+    return {
+        "key": key,
+        "summary": {
+            "old_count": len(old_index),
+            "new_count": len(new_index),
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+            "unchanged": unchanged,
+        },
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
+
+
+def diff_collections(old_records: list, new_records: list, key: str = "id",
+                     old_hashes: dict = None, new_hashes: dict = None) -> dict:
+    """Machine-readable changeset between two collections aligned on `key`.
+
+    When per-record hashes are supplied (key -> digest, e.g. from snapshot
+    manifests) they decide whether a record changed; otherwise dict
+    equality does.
+    """
+    key_fn = key_function(key)
+    old_index = _index(old_records, key_fn)
+    new_index = _index(new_records, key_fn)
+
+    if old_hashes is not None and new_hashes is not None:
+        def is_same(k):
+            return old_hashes.get(k) == new_hashes.get(k)
+    else:
+        def is_same(k):
+            old, new = old_index[k], new_index[k]
+            return old is new or old == new
+
+    return _diff_indexes(old_index, new_index, key, is_same)
+
+
+def changed_records(changeset: dict, old_records: list, new_records: list) -> tuple:
+    """(old versions, new versions) of every record a changeset touches.
+
+    Lets incremental consumers (e.g. Cube.update) retract and re-add just
+    those records instead of rebuilding from the whole collection.
+    """
+    key_fn = key_function(changeset["key"])
+    keys = [entry["key"] for entry in changeset["changed"]]
+    old_index = _index(old_records, key_fn)
+    new_index = _index(new_records, key_fn)
+    old = [entry["record"] for entry in changeset["removed"]] + [old_index[k] for k in keys]
+    new = [entry["record"] for entry in changeset["added"]] + [new_index[k] for k in keys]
+    return old, new
+
+
+def diff_versions(store: SnapshotStore, version_a: str, version_b: str) -> dict:
+    """Diff two snapshot versions by id, loading blobs only for records that differ."""
+    def digests(version):
+        result = {}
+        seen = {}
+        for record_id, digest in store.manifest(version)["records"]:
+            n = seen.get(record_id, 0)
+            seen[record_id] = n + 1
+            result[record_id if n == 0 else (record_id, n)] = digest
+        return result
+
+    old_digests = digests(version_a)
+    new_digests = digests(version_b)
+
+    def is_same(k):
+        return old_digests[k] == new_digests[k]
+
+    def lazy_index(own, other):
+        # Records identical on both sides stay in the manifest; only the rest are read
+        return {k: (store.load_record(d) if k not in other or other[k] != d else None)
+                for k, d in own.items()}
+
+    return _diff_indexes(lazy_index(old_digests, new_digests),
+                         lazy_index(new_digests, old_digests), "id", is_same)
+
+
+def print_changeset(changeset: dict, limit: int = 20):
+    summary = changeset["summary"]
+    print(f"Key: {changeset['key']}")
+    print(f"Old: {summary['old_count']}  New: {summary['new_count']}")
+    print(f"Added: {summary['added']}  Removed: {summary['removed']}  "
+          f"Changed: {summary['changed']}  Unchanged: {summary['unchanged']}")
+    for entry in changeset["changed"][:limit]:
+        print(f"\n  ~ {entry['key']}")
+        for path, change in entry["fields"].items():
+            if "added" in change:
+                print(f"      {path}: +{change['added']} -{change['removed']}")
+            elif change.get("reordered"):
+                print(f"      {path}: reordered")
+            else:
+                print(f"      {path}: {str(change['old'])[:40]!r} -> {str(change['new'])[:40]!r}")
+    if len(changeset["changed"]) > limit:
+        print(f"\n  ... {len(changeset['changed']) - limit} more changed records")
+
+
+def _json_key(key):
+    return list(key) if isinstance(key, tuple) else key
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyed structural diff of two session snapshots")
+    parser.add_argument("old", help="old JSON file (or snapshot version with --versions)")
+    parser.add_argument("new", help="new JSON file (or snapshot version with --versions)")
+    parser.add_argument("--key", default="id", help="id, event_id or comma-separated composite key")
+    parser.add_argument("--versions", action="store_true", help="diff two snapshot_store versions")
+    parser.add_argument("--output", help="write the changeset as JSON")
+    args = parser.parse_args()
+
+    if args.versions:
+        changeset = diff_versions(SnapshotStore(), args.old, args.new)
+    else:
+        with open(args.old, "r", encoding="utf-8") as f:
+            old_records = json.load(f)
+        with open(args.new, "r", encoding="utf-8") as f:
+            new_records = json.load(f)
+        changeset = diff_collections(old_records, new_records, args.key)
+
+    print_changeset(changeset)
+
+    if args.output:
+        for section in ("added", "removed", "changed"):
+            for entry in changeset[section]:
+                entry["key"] = _json_key(entry["key"])
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(changeset, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Changeset saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Content-Addressed Snapshot Store
+Replaces full timestamped copies of sessions_enriched.json with per-record
+blobs deduplicated by hash plus one small manifest per version, so a
+backup costs roughly the size of what changed.
+
+Layout (under data/enriched/backups/snapshots/ by default):
+    objects/ab/cdef...   zlib-compressed canonical JSON of one record
+    manifests/<version>.json   ordered [id, hash] list + metadata
+
+All writes go to a temp file first and are renamed into place.
+
+Usage:
+    python snapshot_store.py snapshot sessions_enriched.json [label]
+    python snapshot_store.py list
+    python snapshot_store.py restore <version> <output.json>
+    python snapshot_store.py diff <version_a> <version_b>
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zlib
+from datetime import datetime
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+DEFAULT_ROOT = os.path.join(DATA_DIR, "enriched", "backups", "snapshots")
+
+
+def canonical_bytes(record: dict) -> bytes:
+    return json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def record_hash(record: dict) -> str:
+    return hashlib.sha256(canonical_bytes(record)).hexdigest()
+
+
+def file_mode(path: str) -> int:
+    """Keep the target's permissions, or what a plain open() would have created."""
+    if os.path.exists(path):
+        return os.stat(path).st_mode & 0o777
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write(path: str, data: bytes):
+    """Write bytes to `path` via a temp file in the same directory + rename."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        os.chmod(tmp_path, file_mode(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data, **kwargs):
+    """json.dump equivalent of atomic_write; kwargs default to the repo's indent=2 style."""
+    kwargs.setdefault("indent", 2)
+    kwargs.setdefault("ensure_ascii", False)
+    atomic_write(path, json.dumps(data, **kwargs).encode("utf-8"))
+
+
+class SnapshotStore:
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifests_dir = os.path.join(root, "manifests")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _manifest_path(self, version: str) -> str:
+        return os.path.join(self.manifests_dir, f"{version}.json")
+
+    def snapshot(self, records: list, label: str = "", source: str = None) -> dict:
+        """Store a version of `records`; only blobs not already present are written."""
+        entries = []
+        new_blobs = 0
+        new_bytes = 0
+        for record in records:
+            data = canonical_bytes(record)
+            digest = hashlib.sha256(data).hexdigest()
+            path = self._object_path(digest)
+            if not os.path.exists(path):
+                blob = zlib.compress(data, 9)
+                atomic_write(path, blob)
+                new_blobs += 1
+                new_bytes += len(blob)
+            entries.append([record.get("id"), digest])
+
+        created_at = datetime.now()
+        version = created_at.strftime("%Y%m%d_%H%M%S_%f")
+        if label:
+            version += "_" + "".join(c if c.isalnum() or c in "-_" else "-" for c in label)
+        manifest = {
+            "version": version,
+            "created_at": created_at.isoformat(timespec="seconds"),
+            "label": label,
+            "source": source,
+            "count": len(entries),
+            "records": entries,
+        }
+        atomic_write_json(self._manifest_path(version), manifest, indent=None, separators=(",", ":"))
+        return {"version": version, "count": len(entries), "new_blobs": new_blobs, "new_bytes": new_bytes}
+
+    def snapshot_file(self, path: str, label: str = "") -> dict:
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        return self.snapshot(records, label=label, source=os.path.abspath(path))
+
+    def versions(self) -> list:
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.manifests_dir) if name.endswith(".json"))
+
+    def latest(self) -> str:
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def manifest(self, version: str) -> dict:
+        with open(self._manifest_path(version), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_record(self, digest: str) -> dict:
+        with open(self._object_path(digest), "rb") as f:
+            return json.loads(zlib.decompress(f.read()).decode("utf-8"))
+
+    def restore(self, version: str) -> list:
+        """Records of a version, in their original order."""
+        cache = {}
+        records = []
+        for _, digest in self.manifest(version)["records"]:
+            if digest not in cache:
+                cache[digest] = self.load_record(digest)
+            records.append(cache[digest])
+        return records
+
+    def restore_to(self, version: str, path: str):
+        """Write a version back as an artifact, so its .sha256/.gz and manifest entry match."""
+        from artifacts import write_artifact  # artifacts imports this module
+        write_artifact(path, self.restore(version), sort_by=None)
+
+    def diff(self, version_a: str, version_b: str) -> dict:
+        """Record-level diff between two versions, computed from manifests only.
+
+        Records are aligned by (id, nth occurrence of that id) so duplicated
+        ids in the enriched data still line up.
+        """
+        def keyed(version):
+            seen = {}
+            keyed_entries = {}
+            for record_id, digest in self.manifest(version)["records"]:
+                n = seen.get(record_id, 0)
+                seen[record_id] = n + 1
+                keyed_entries[(record_id, n)] = digest
+            return keyed_entries
+
+        a = keyed(version_a)
+        b = keyed(version_b)
+        return {
+            "added": sorted((k for k in b if k not in a), key=str),
+            "removed": sorted((k for k in a if k not in b), key=str),
+            "changed": sorted((k for k in a if k in b and a[k] != b[k]), key=str),
+            "unchanged": sum(1 for k in a if k in b and a[k] == b[k]),
+        }
+
+
+def main():
+    args = sys.argv[1:]
+    store = SnapshotStore()
+    command = args[0] if args else "list"
+
+    if command == "snapshot" and len(args) > 1:
+        result = store.snapshot_file(args[1], label=args[2] if len(args) > 2 else "")
+        print(f"✓ Snapshot {result['version']}: {result['count']} records, "
+              f"{result['new_blobs']} new blobs ({result['new_bytes']:,} bytes)")
+
+    elif command == "list":
+        for version in store.versions():
+            manifest = store.manifest(version)
+            print(f"  {version}  {manifest['count']} records  {manifest.get('label') or ''}")
+
+    elif command == "restore" and len(args) > 2:
+        store.restore_to(args[1], args[2])
+        print(f"✓ Restored {args[1]} to {args[2]}")
+
+    elif command == "diff" and len(args) > 2:
+        result = store.diff(args[1], args[2])
+        print(f"Added: {len(result['added'])}, removed: {len(result['removed'])}, "
+              f"changed: {len(result['changed'])}, unchanged: {result['unchanged']}")
+        for label in ("added", "removed", "changed"):
+            for record_id, n in result[label]:
+                suffix = f" (occurrence {n + 1})" if n else ""
+                print(f"  {label}: ID {record_id}{suffix}")
+
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
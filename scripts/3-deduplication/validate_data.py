@@ -0,0 +1,371 @@
+"""
+Dataset Validation
+Runs a declarative set of invariants over a session, event or exhibitor
+file in one pass and returns a structured violation report. Stages call
+gate() on their output before writing it, so a bad file never reaches the
+next stage.
+
+Each profile lists the rules that apply to one kind of file and whether a
+violation is an error (gate fails) or a warning (reported only):
+  sessions        extract_session shape (raw scrape, merge output)
+  enriched        sessions_enriched.json before dedupe (duplicates expected)
+  enriched_clean  dedupe output
+  events          data/production/events.json (taxonomy keywords/personas)
+  exhibitors      data/production/exhibitors.json
+
+Large inputs are split into chunks and checked on a process pool; the
+per-record rules run in the workers and the dataset-wide ones (unique ids,
+heavy-hitter count) are combined from per-chunk facts.
+
+Usage:
+    python validate_data.py enriched sessions_enriched.json
+    python validate_data.py events ../../data/production/events.json [--report report.json]
+    python validate_data.py events big.json --workers 8
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+KEYWORD_TAXONOMY_PATH = os.path.join(DATA_DIR, "taxonomies", "keyword_taxonomy_100.json")
+PERSONA_TAXONOMY_PATH = os.path.join(DATA_DIR, "taxonomies", "persona_taxonomy_22.json")
+
+ERROR = "error"
+WARNING = "warning"
+
+# fix_heavy_hitters.py aims for ~40 and warns above 50
+HEAVY_HITTER_RANGE = (20, 50)
+
+PARALLEL_MIN_RECORDS = 20000
+CHUNK_SIZE = 5000
+MAX_PRINTED = 15
+
+DATE_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])$")
+TIME_RE = re.compile(r"^([01]\d|2[0-3]):[0-5]\d:[0-5]\d\.\d{3}$")
+
+# The CMS has handed out the same event_id to two different sessions
+# (5353/5359) and leaves it empty for some, so only the numeric id is a key
+_SESSION_RULES = {
+    "unique_id": ERROR,
+    "unique_event_id": WARNING,
+    "non_empty_title": ERROR,
+    "date_format": ERROR,
+    "time_format": ERROR,
+    "time_order": ERROR,
+}
+
+PROFILES = {
+    "sessions": _SESSION_RULES,
+    "enriched": {
+        **_SESSION_RULES,
+        "unique_id": WARNING,
+        "technical_depth": ERROR,
+        "personas_mapped": WARNING,
+        "keywords_mapped": WARNING,
+        "heavy_hitter_range": WARNING,
+    },
+    "enriched_clean": {
+        **_SESSION_RULES,
+        "technical_depth": ERROR,
+        "personas_mapped": WARNING,
+        "keywords_mapped": WARNING,
+        "heavy_hitter_range": ERROR,
+    },
+    "events": {
+        **_SESSION_RULES,
+        "keyword_taxonomy": ERROR,
+        "persona_taxonomy": ERROR,
+        "heavy_hitter_range": ERROR,
+    },
+    "exhibitors": {
+        "unique_id": ERROR,
+        "non_empty_name": ERROR,
+        "keyword_taxonomy": ERROR,
+        "persona_taxonomy": ERROR,
+    },
+}
+
+
+class ValidationError(ValueError):
+    """Raised by gate() when a dataset has error-level violations."""
+
+    def __init__(self, report: dict):
+        self.report = report
+        super().__init__(f"{report['label']}: {report['errors']} validation errors "
+                         f"({', '.join(report['failed_rules'])})")
+
+
+def load_taxonomy() -> dict:
+    """Lookup sets for the taxonomy rules."""
+    with open(KEYWORD_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        keywords = json.load(f)
+    with open(PERSONA_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        personas = json.load(f)
+    return {
+        "keyword_to_category": keywords["mappings"]["keyword_to_category"],
+        "original_keywords": set(keywords["mappings"]["original_to_consolidated"]),
+        "persona_categories": {c["category"] for c in personas["categories"]},
+        "original_personas": set(personas["mappings"]["persona_to_category"]),
+    }
+
+
+# ─── RECORD RULES ─────────────────────────────────────────
+# rule(record, taxonomy) -> [(field, message)]
+
+def _non_empty_title(record, taxonomy):
+    if not str(record.get("title") or "").strip():
+        return [("title", "empty title")]
+    return []
+
+
+def _non_empty_name(record, taxonomy):
+    if not str(record.get("name") or "").strip():
+        return [("name", "empty name")]
+    return []
+
+
+def _date_format(record, taxonomy):
+    value = record.get("date")
+    if not isinstance(value, str) or not DATE_RE.match(value):
+        return [("date", f"expected YYYY-MM-DD, got {value!r}")]
+    return []
+
+
+def _time_format(record, taxonomy):
+    problems = []
+    for field in ("start_time", "end_time"):
+        value = record.get(field)
+        if value is None and field == "end_time":
+            continue
+        if not isinstance(value, str) or not TIME_RE.match(value):
+            problems.append((field, f"expected HH:MM:SS.000, got {value!r}"))
+    return problems
+
+
+def _time_order(record, taxonomy):
+    start, end = record.get("start_time"), record.get("end_time")
+    if isinstance(start, str) and isinstance(end, str) and TIME_RE.match(start) and TIME_RE.match(end):
+        if end <= start:
+            return [("end_time", f"end {end[:5]} is not after start {start[:5]}")]
+    return []
+
+
+def _technical_depth(record, taxonomy):
+    value = record.get("technical_depth")
+    if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= 5:
+        return [("technical_depth", f"expected integer 1-5, got {value!r}")]
+    return []
+
+
+def _keywords_mapped(record, taxonomy):
+    """Enriched keywords are free text; apply_taxonomies.js drops any it cannot map."""
+    keywords = record.get("keywords")
+    if not isinstance(keywords, list) or not keywords:
+        return [("keywords", "no keywords")]
+    unmapped = [k for k in keywords if str(k).lower().strip() not in taxonomy["original_keywords"]]
+    if unmapped:
+        return [("keywords", f"not in keyword taxonomy: {unmapped}")]
+    return []
+
+
+def _personas_mapped(record, taxonomy):
+    personas = record.get("target_personas")
+    if not isinstance(personas, list) or not personas:
+        return [("target_personas", "no target personas")]
+    unmapped = [p for p in personas if str(p).strip() not in taxonomy["original_personas"]]
+    if unmapped:
+        return [("target_personas", f"not in persona taxonomy: {unmapped}")]
+    return []
+
+
+def _keyword_taxonomy(record, taxonomy):
+    keywords = record.get("keywords")
+    if not isinstance(keywords, list):
+        return [("keywords", f"expected a list, got {type(keywords).__name__}")]
+    problems = []
+    for entry in keywords:
+        keyword = entry.get("keyword") if isinstance(entry, dict) else None
+        category = taxonomy["keyword_to_category"].get(keyword)
+        if category is None:
+            problems.append(("keywords", f"unknown keyword {entry!r}"))
+        elif entry.get("category") != category:
+            problems.append(("keywords", f"{keyword!r} belongs to {category!r}, not {entry.get('category')!r}"))
+    return problems
+
+
+def _persona_taxonomy(record, taxonomy):
+    personas = record.get("target_personas")
+    if not isinstance(personas, list):
+        return [("target_personas", f"expected a list, got {type(personas).__name__}")]
+    unknown = [p for p in personas if p not in taxonomy["persona_categories"]]
+    if unknown:
+        return [("target_personas", f"unknown persona categories: {unknown}")]
+    return []
+
+
+RECORD_RULES = {
+    "non_empty_title": _non_empty_title,
+    "non_empty_name": _non_empty_name,
+    "date_format": _date_format,
+    "time_format": _time_format,
+    "time_order": _time_order,
+    "technical_depth": _technical_depth,
+    "keywords_mapped": _keywords_mapped,
+    "personas_mapped": _personas_mapped,
+    "keyword_taxonomy": _keyword_taxonomy,
+    "persona_taxonomy": _persona_taxonomy,
+}
+
+# Rules that need the whole dataset; fed from per-chunk facts
+UNIQUE_FIELDS = {"unique_id": "id", "unique_event_id": "event_id"}
+
+
+# ─── ENGINE ───────────────────────────────────────────────
+
+def _check_chunk(profile: str, offset: int, records: list, taxonomy: dict) -> dict:
+    """One pass over a chunk: record rules plus the facts dataset rules need."""
+    rules = PROFILES[profile]
+    record_rules = [(name, RECORD_RULES[name], severity) for name, severity in rules.items()
+                    if name in RECORD_RULES]
+    unique_fields = [(name, UNIQUE_FIELDS[name]) for name in rules if name in UNIQUE_FIELDS]
+
+    violations = []
+    keys = {name: [] for name, _ in unique_fields}
+    heavy_hitters = 0
+    for index, record in enumerate(records, start=offset):
+        if not isinstance(record, dict):
+            violations.append({"rule": "record_type", "severity": ERROR, "index": index, "id": None,
+                               "field": None, "message": f"expected an object, got {type(record).__name__}"})
+            continue
+        for name, rule, severity in record_rules:
+            for field, message in rule(record, taxonomy):
+                violations.append({"rule": name, "severity": severity, "index": index,
+                                   "id": record.get("id"), "field": field, "message": message})
+        for name, field in unique_fields:
+            keys[name].append((index, record.get("id"), record.get(field)))
+        if (record.get("networking_signals") or {}).get("is_heavy_hitter"):
+            heavy_hitters += 1
+    return {"violations": violations, "keys": keys, "heavy_hitters": heavy_hitters}
+
+
+def validate_records(records: list, profile: str, label: str = None,
+                     taxonomy: dict = None, workers: int = None) -> dict:
+    """Structured violation report for one dataset."""
+    rules = PROFILES[profile]
+    if taxonomy is None:
+        needs_taxonomy = {"keywords_mapped", "personas_mapped", "keyword_taxonomy", "persona_taxonomy"}
+        taxonomy = load_taxonomy() if needs_taxonomy & set(rules) else {}
+
+    chunks = [(i, records[i:i + CHUNK_SIZE]) for i in range(0, len(records), CHUNK_SIZE)]
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(chunks)) if len(records) >= PARALLEL_MIN_RECORDS else 1
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_check_chunk, [profile] * len(chunks), [c[0] for c in chunks],
+                                    [c[1] for c in chunks], [taxonomy] * len(chunks)))
+    else:
+        results = [_check_chunk(profile, offset, chunk, taxonomy) for offset, chunk in chunks]
+
+    violations = [v for result in results for v in result["violations"]]
+
+    for name, field in UNIQUE_FIELDS.items():
+        if name not in rules:
+            continue
+        positions = defaultdict(list)
+        for result in results:
+            for index, record_id, value in result["keys"][name]:
+                if value is None and field != "id":
+                    continue
+                positions[value].append((index, record_id))
+        for value, seen in positions.items():
+            if value is None:
+                for index, _ in seen:
+                    violations.append({"rule": name, "severity": rules[name], "index": index, "id": None,
+                                       "field": field, "message": f"missing {field}"})
+                continue
+            for index, record_id in seen[1:]:
+                violations.append({"rule": name, "severity": rules[name], "index": index, "id": record_id,
+                                   "field": field, "message": f"{field} {value!r} repeats record {seen[0][0]}"})
+
+    heavy_hitters = sum(result["heavy_hitters"] for result in results)
+    if "heavy_hitter_range" in rules:
+        low, high = HEAVY_HITTER_RANGE
+        if not low <= heavy_hitters <= high:
+            violations.append({"rule": "heavy_hitter_range", "severity": rules["heavy_hitter_range"],
+                               "index": None, "id": None, "field": "networking_signals.is_heavy_hitter",
+                               "message": f"{heavy_hitters} heavy hitters, target range is {low}-{high}"})
+
+    violations.sort(key=lambda v: (v["index"] is None, v["index"] or 0, v["rule"]))
+    severities = Counter(v["severity"] for v in violations)
+    return {
+        "label": label or profile,
+        "profile": profile,
+        "records": len(records),
+        "heavy_hitters": heavy_hitters,
+        "ok": severities[ERROR] == 0,
+        "errors": severities[ERROR],
+        "warnings": severities[WARNING],
+        "by_rule": dict(Counter(v["rule"] for v in violations).most_common()),
+        "failed_rules": sorted({v["rule"] for v in violations if v["severity"] == ERROR}),
+        "violations": violations,
+    }
+
+
+def validate_file(path: str, profile: str, workers: int = None) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    return validate_records(records, profile, label=os.path.basename(path), workers=workers)
+
+
+def print_report(report: dict, limit: int = MAX_PRINTED):
+    status = "✓" if report["ok"] else "✗"
+    print(f"  {status} {report['label']} ({report['profile']}): {report['records']} records, "
+          f"{report['errors']} errors, {report['warnings']} warnings")
+    for rule, count in report["by_rule"].items():
+        print(f"      {rule}: {count}")
+    shown = sorted(report["violations"], key=lambda v: v["severity"] != ERROR)[:limit]
+    for v in shown:
+        marker = "✗" if v["severity"] == ERROR else "⚠️ "
+        where = f"#{v['index']} id={v['id']}" if v["index"] is not None else "dataset"
+        print(f"    {marker} [{v['rule']}] {where}: {v['message']}")
+    if len(report["violations"]) > limit:
+        print(f"    ... {len(report['violations']) - limit} more")
+
+
+def gate(records: list, profile: str, label: str) -> dict:
+    """Validate a stage's output before it is written; raises ValidationError on errors."""
+    report = validate_records(records, profile, label=label)
+    if not report["ok"] or report["warnings"]:
+        print_report(report)
+    if not report["ok"]:
+        raise ValidationError(report)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a dataset against a rule profile")
+    parser.add_argument("profile", choices=sorted(PROFILES))
+    parser.add_argument("path", help="JSON array to validate")
+    parser.add_argument("--workers", type=int, help="process pool size (default: auto for large files)")
+    parser.add_argument("--report", help="write the full violation report as JSON")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"VALIDATING {args.path}")
+    print("=" * 70)
+    report = validate_file(args.path, args.profile, args.workers)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Report saved to: {args.report}")
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Columnar Session Export
+Writes session/exhibitor datasets as one directory per table with one file
+per column, so rollups read only the columns they touch instead of
+re-parsing sessions.csv or the full JSON arrays.
+
+Layout (Arrow-style, stdlib only):
+    <table>/_schema.json          row count + column kinds
+    <col>.dict.json + <col>.codes dictionary-encoded categorical (uint32 codes, 0 = null)
+    <col>.offsets + <col>.codes   list column (offsets into flattened codes)
+    <col>.json                    plain column (free text, numbers)
+
+Nested objects are flattened with dots (networking_signals.is_heavy_hitter),
+and lists of objects are split per key (keywords.keyword, keywords.category).
+
+Usage:
+    python columnar.py                       # export raw + production datasets
+    python columnar.py rollup production_events date --where networking_signals.is_heavy_hitter=true
+"""
+
+import json
+import os
+import sys
+from array import array
+from collections import Counter
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+COLUMNAR_DIR = os.path.join(DATA_DIR, "columnar")
+
+# table name -> source file (relative to data/)
+EXPORTS = {
+    "raw_sessions": "raw/sessions.json",
+    "production_events": "production/events.json",
+    "production_exhibitors": "production/exhibitors.json",
+}
+
+# Scalar columns worth dictionary-encoding; every list column is encoded too
+CATEGORICAL = {
+    "date", "venue", "room", "session_type", "technical_depth",
+    "networking_signals.is_heavy_hitter",
+    "networking_signals.decision_maker_density",
+    "networking_signals.investor_presence",
+    "add_to_calendar",
+}
+
+# '; '-joined strings in the CMS scrape that are really lists
+SPLIT_FIELDS = {"speakers", "knowledge_partners"}
+
+CODE_TYPE = "I"  # uint32
+
+
+def _write_codes(path: str, values: list):
+    codes = array(CODE_TYPE, values)
+    if sys.byteorder == "big":
+        codes.byteswap()
+    with open(path, "wb") as f:
+        codes.tofile(f)
+
+
+def _read_codes(path: str) -> array:
+    codes = array(CODE_TYPE)
+    with open(path, "rb") as f:
+        codes.frombytes(f.read())
+    if sys.byteorder == "big":
+        codes.byteswap()
+    return codes
+
+
+def _flatten(record: dict) -> tuple:
+    """Split a record into scalar columns and list columns."""
+    scalars = {}
+    lists = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                scalars[f"{key}.{sub_key}"] = sub_value
+        elif isinstance(value, list):
+            if not value:
+                continue  # absent list columns read back as []
+            if all(isinstance(v, dict) for v in value):
+                for sub_key in {k for v in value for k in v}:
+                    lists[f"{key}.{sub_key}"] = [v.get(sub_key) for v in value]
+            else:
+                lists[key] = value
+        elif key in SPLIT_FIELDS:
+            lists[key] = [v.strip() for v in (value or "").split(";") if v.strip()]
+        else:
+            scalars[key] = value
+    return scalars, lists
+
+
+class _Dictionary:
+    """Value -> code mapping; code 0 is reserved for null."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value) -> int:
+        if value is None:
+            return 0
+        key = json.dumps(value)
+        code = self.codes.get(key)
+        if code is None:
+            self.values.append(value)
+            code = len(self.values)
+            self.codes[key] = code
+        return code
+
+
+def write_table(records: list, table_dir: str) -> dict:
+    """Write records as a columnar table and return its schema."""
+    os.makedirs(table_dir, exist_ok=True)
+    flat = [_flatten(r) for r in records]
+    scalar_names = sorted({name for scalars, _ in flat for name in scalars})
+    list_names = sorted({name for _, lists in flat for name in lists})
+    columns = {}
+
+    for name in scalar_names:
+        values = [scalars.get(name) for scalars, _ in flat]
+        if name in CATEGORICAL:
+            dictionary = _Dictionary()
+            _write_codes(os.path.join(table_dir, f"{name}.codes"), [dictionary.encode(v) for v in values])
+            with open(os.path.join(table_dir, f"{name}.dict.json"), "w", encoding="utf-8") as f:
+                json.dump(dictionary.values, f, ensure_ascii=False)
+            columns[name] = {"kind": "dict", "cardinality": len(dictionary.values)}
+        else:
+            with open(os.path.join(table_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+                json.dump(values, f, ensure_ascii=False, separators=(",", ":"))
+            columns[name] = {"kind": "plain"}
+
+    for name in list_names:
+        dictionary = _Dictionary()
+        offsets = [0]
+        codes = []
+        for _, lists in flat:
+            codes.extend(dictionary.encode(v) for v in lists.get(name) or [])
+            offsets.append(len(codes))
+        _write_codes(os.path.join(table_dir, f"{name}.offsets"), offsets)
+        _write_codes(os.path.join(table_dir, f"{name}.codes"), codes)
+        with open(os.path.join(table_dir, f"{name}.dict.json"), "w", encoding="utf-8") as f:
+            json.dump(dictionary.values, f, ensure_ascii=False)
+        columns[name] = {"kind": "list", "cardinality": len(dictionary.values)}
+
+    schema = {"num_rows": len(records), "columns": columns}
+    with open(os.path.join(table_dir, "_schema.json"), "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2, ensure_ascii=False)
+    return schema
+
+
+class ColumnarTable:
+    """Lazy reader: each column file is loaded the first time it is needed."""
+
+    def __init__(self, table_dir: str):
+        self.table_dir = table_dir
+        with open(os.path.join(table_dir, "_schema.json"), "r", encoding="utf-8") as f:
+            self.schema = json.load(f)
+        self.num_rows = self.schema["num_rows"]
+        self._cache = {}
+
+    @property
+    def column_names(self) -> list:
+        return list(self.schema["columns"])
+
+    def kind(self, name: str) -> str:
+        if name not in self.schema["columns"]:
+            raise KeyError(f"Unknown column: {name}")
+        return self.schema["columns"][name]["kind"]
+
+    def _load(self, name: str, part: str):
+        key = (name, part)
+        if key not in self._cache:
+            path = os.path.join(self.table_dir, f"{name}.{part}")
+            if part.endswith("json"):
+                with open(path, "r", encoding="utf-8") as f:
+                    self._cache[key] = json.load(f)
+            else:
+                self._cache[key] = _read_codes(path)
+        return self._cache[key]
+
+    def dictionary(self, name: str) -> list:
+        return self._load(name, "dict.json")
+
+    def _code_of(self, name: str, value) -> int:
+        """Dictionary code for a value, or -1 if the value never occurs."""
+        if value is None:
+            return 0
+        key = (name, "reverse")
+        if key not in self._cache:
+            self._cache[key] = {json.dumps(v): i for i, v in enumerate(self.dictionary(name), start=1)}
+        return self._cache[key].get(json.dumps(value), -1)
+
+    def _row_matches(self, name: str, op: str, value, rows) -> list:
+        """Evaluate one predicate on the encoded column, restricted to `rows`."""
+        kind = self.kind(name)
+        if kind == "plain":
+            values = self._load(name, "json")
+            if op == "==":
+                return [i for i in rows if values[i] == value]
+            if op == "!=":
+                return [i for i in rows if values[i] != value]
+            if op == "in":
+                wanted = set(value)
+                return [i for i in rows if values[i] in wanted]
+            raise ValueError(f"Operator '{op}' not supported on plain column {name}")
+
+        codes = self._load(name, "codes")
+        if op in ("==", "!=", "contains"):
+            targets = {self._code_of(name, value)}
+        elif op == "in":
+            targets = {self._code_of(name, v) for v in value}
+        else:
+            raise ValueError(f"Unknown operator: {op}")
+
+        if kind == "dict":
+            if op == "!=":
+                return [i for i in rows if codes[i] not in targets]
+            return [i for i in rows if codes[i] in targets]
+
+        offsets = self._load(name, "offsets")
+        if op == "!=":
+            return [i for i in rows if not targets.intersection(codes[offsets[i]:offsets[i + 1]])]
+        return [i for i in rows if targets.intersection(codes[offsets[i]:offsets[i + 1]])]
+
+    def filter_rows(self, filters: list = None) -> list:
+        """Row indices matching every (column, op, value) predicate.
+
+        Ops: '==', '!=', 'in'; on list columns '==' / 'contains' mean
+        "any element equals". Only the predicate columns are read.
+        """
+        rows = range(self.num_rows)
+        for name, op, value in filters or []:
+            rows = self._row_matches(name, op, value, rows)
+        return list(rows)
+
+    def column_values(self, name: str, rows: list = None) -> list:
+        """Decoded values of one column for the given rows (default: all)."""
+        rows = range(self.num_rows) if rows is None else rows
+        kind = self.kind(name)
+        if kind == "plain":
+            values = self._load(name, "json")
+            return [values[i] for i in rows]
+        dictionary = [None] + self.dictionary(name)
+        codes = self._load(name, "codes")
+        if kind == "dict":
+            return [dictionary[codes[i]] for i in rows]
+        offsets = self._load(name, "offsets")
+        return [[dictionary[c] for c in codes[offsets[i]:offsets[i + 1]]] for i in rows]
+
+    def read(self, columns: list = None, filters: list = None) -> list:
+        """Projection + predicate pushdown: rows as dicts with only `columns`."""
+        rows = self.filter_rows(filters)
+        names = columns or self.column_names
+        data = {name: self.column_values(name, rows) for name in names}
+        return [{name: data[name][j] for name in names} for j in range(len(rows))]
+
+    def count_by(self, name: str, filters: list = None) -> Counter:
+        """Group-by count scanning only `name` and the filter columns."""
+        rows = self.filter_rows(filters)
+        kind = self.kind(name)
+        if kind == "plain":
+            return Counter(self.column_values(name, rows))
+        dictionary = [None] + self.dictionary(name)
+        codes = self._load(name, "codes")
+        if kind == "dict":
+            code_counts = Counter(codes[i] for i in rows)
+        else:
+            offsets = self._load(name, "offsets")
+            code_counts = Counter(c for i in rows for c in codes[offsets[i]:offsets[i + 1]])
+        return Counter({dictionary[c]: n for c, n in code_counts.items()})
+
+
+def _parse_where(expr: str) -> tuple:
+    name, _, raw = expr.partition("=")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return (name, "==", value)
+
+
+def main():
+    args = sys.argv[1:]
+
+    if args and args[0] == "rollup":
+        if len(args) < 3:
+            print("Usage: python columnar.py rollup <table> <column> [--where col=value ...]")
+            return
+        table = ColumnarTable(os.path.join(COLUMNAR_DIR, args[1]))
+        filters = [_parse_where(args[i + 1]) for i, a in enumerate(args) if a == "--where"]
+        counts = table.count_by(args[2], filters)
+        print(f"{args[1]}: count by {args[2]}" + (f" where {filters}" if filters else ""))
+        for value, count in sorted(counts.items(), key=lambda x: -x[1]):
+            print(f"  {value}: {count}")
+        return
+
+    print("=" * 70)
+    print(f"COLUMNAR EXPORT -> {COLUMNAR_DIR}")
+    print("=" * 70)
+    for table, rel_path in EXPORTS.items():
+        path = os.path.join(DATA_DIR, rel_path)
+        if not os.path.exists(path):
+            print(f"  - {table}: {rel_path} not found, skipped")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        schema = write_table(records, os.path.join(COLUMNAR_DIR, table))
+        dict_cols = sum(1 for c in schema["columns"].values() if c["kind"] != "plain")
+        print(f"  ✓ {table}: {schema['num_rows']} rows, {len(schema['columns'])} columns "
+              f"({dict_cols} dictionary-encoded)")
+
+
+if __name__ == "__main__":
+    main()
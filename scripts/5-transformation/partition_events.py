@@ -0,0 +1,183 @@
+"""
+Date-Partitioned Production Events
+Splits data/production/events.json into one shard per date under
+data/production/partitions/<summit>/, each written as compact JSON plus a
+pre-compressed .json.gz, and a manifest with counts, checksums and an
+id -> shard map. Loaders open the manifest and only the shards they need.
+
+Several summits can live side by side (one directory each); a single-day
+query still reads one manifest and one shard.
+
+Usage:
+    python partition_events.py [events.json] [--summit india-ai-impact-2026]
+    python partition_events.py --show [--summit ...]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "3-deduplication"))
+from artifacts import write_artifact  # noqa: E402
+from validate_data import gate  # noqa: E402
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+EVENTS_PATH = os.path.join(DATA_DIR, "production", "events.json")
+PARTITIONS_DIR = os.path.join(DATA_DIR, "production", "partitions")
+DEFAULT_SUMMIT = "india-ai-impact-2026"
+MANIFEST_NAME = "manifest.json"
+UNDATED_SHARD = "undated"
+
+
+def _write_json_pair(path: str, payload) -> dict:
+    """Write canonical JSON with its .gz and .sha256; return sizes and checksum of the JSON.
+
+    Shards keep their (start_time, id) order, and the partition manifest
+    replaces the directory's artifacts.json.
+    """
+    entry = write_artifact(path, payload, sort_by=None, manifest=False)
+    return {key: entry[key] for key in ("bytes", "gzip_bytes", "sha256")}
+
+
+def write_partitions(events: list, summit: str = DEFAULT_SUMMIT, root: str = PARTITIONS_DIR) -> dict:
+    """Shard events by date and write shards + manifest for one summit."""
+    summit_dir = os.path.join(root, summit)
+    os.makedirs(summit_dir, exist_ok=True)
+
+    by_date = defaultdict(list)
+    for event in events:
+        by_date[event.get("date") or UNDATED_SHARD].append(event)
+
+    shards = {}
+    id_index = {}
+    for shard in sorted(by_date):
+        shard_events = sorted(by_date[shard], key=lambda e: (e.get("start_time") or "", str(e.get("id"))))
+        filename = f"{shard}.json"
+        info = _write_json_pair(os.path.join(summit_dir, filename), shard_events)
+        venues = defaultdict(int)
+        for event in shard_events:
+            venues[event.get("venue") or ""] += 1
+            id_index.setdefault(str(event.get("id")), shard)
+        shards[shard] = {
+            "file": filename,
+            "gzip_file": filename + ".gz",
+            "count": len(shard_events),
+            "venues": dict(sorted(venues.items())),
+            **info,
+        }
+
+    # Drop shards left over from a previous build whose date no longer exists
+    for name in os.listdir(summit_dir):
+        base = name
+        for suffix in (".gz", ".sha256"):
+            if base.endswith(suffix):
+                base = base[:-len(suffix)]
+        if base.endswith(".json") and base != MANIFEST_NAME and base[:-5] not in shards:
+            os.remove(os.path.join(summit_dir, name))
+
+    manifest = {
+        "summit": summit,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "partition_key": "date",
+        "total": len(events),
+        "shards": shards,
+        "id_index": id_index,
+    }
+    _write_json_pair(os.path.join(summit_dir, MANIFEST_NAME), manifest)
+    return manifest
+
+
+class PartitionedEvents:
+    """Selective loader over one summit's partition directory."""
+
+    def __init__(self, summit: str = DEFAULT_SUMMIT, root: str = PARTITIONS_DIR, verify: bool = False):
+        self.summit_dir = os.path.join(root, summit)
+        self.verify = verify
+        with open(os.path.join(self.summit_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._shards = {}
+
+    def dates(self) -> list:
+        return [d for d in self.manifest["shards"] if d != UNDATED_SHARD]
+
+    def shard(self, name: str) -> list:
+        """Events of one shard; read from disk once."""
+        if name not in self._shards:
+            info = self.manifest["shards"].get(name)
+            if info is None:
+                return []
+            with open(os.path.join(self.summit_dir, info["file"]), "rb") as f:
+                raw = f.read()
+            if self.verify and hashlib.sha256(raw).hexdigest() != info["sha256"]:
+                raise ValueError(f"Checksum mismatch for shard {name} in {self.summit_dir}")
+            self._shards[name] = json.loads(raw.decode("utf-8"))
+        return self._shards[name]
+
+    def load(self, dates: list = None, venues: list = None) -> list:
+        """Events for the given dates (default: all), optionally narrowed to venues.
+
+        Shards without any of the requested venues are skipped using the
+        per-shard venue counts in the manifest.
+        """
+        names = dates if dates is not None else list(self.manifest["shards"])
+        venue_set = set(venues) if venues else None
+        events = []
+        for name in names:
+            info = self.manifest["shards"].get(name)
+            if info is None:
+                continue
+            if venue_set and not venue_set.intersection(info["venues"]):
+                continue
+            shard_events = self.shard(name)
+            if venue_set:
+                shard_events = [e for e in shard_events if e.get("venue") in venue_set]
+            events.extend(shard_events)
+        return events
+
+    def load_ids(self, ids: list) -> list:
+        """Events by id, opening only the shards the id map points to."""
+        id_index = self.manifest["id_index"]
+        wanted = defaultdict(set)
+        for event_id in ids:
+            shard = id_index.get(str(event_id))
+            if shard:
+                wanted[shard].add(str(event_id))
+        found = {}
+        for shard, shard_ids in wanted.items():
+            for event in self.shard(shard):
+                key = str(event.get("id"))
+                if key in shard_ids and key not in found:
+                    found[key] = event
+        return [found[str(i)] for i in ids if str(i) in found]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write date-partitioned production events")
+    parser.add_argument("events", nargs="?", default=EVENTS_PATH, help="source events JSON")
+    parser.add_argument("--summit", default=DEFAULT_SUMMIT, help="summit directory name")
+    parser.add_argument("--show", action="store_true", help="print the existing manifest summary")
+    args = parser.parse_args()
+
+    if args.show:
+        manifest = PartitionedEvents(args.summit).manifest
+    else:
+        with open(args.events, "r", encoding="utf-8") as f:
+            events = json.load(f)
+        gate(events, "events", os.path.basename(args.events))
+        manifest = write_partitions(events, args.summit)
+
+    print("=" * 70)
+    print(f"PARTITIONS: {os.path.join(PARTITIONS_DIR, args.summit)}")
+    print("=" * 70)
+    for shard, info in manifest["shards"].items():
+        print(f"  {shard}: {info['count']:4d} events  {info['bytes']:>9,} bytes  "
+              f"{info['gzip_bytes']:>8,} gzipped  sha256 {info['sha256'][:12]}")
+    print(f"\nTotal: {manifest['total']} events in {len(manifest['shards'])} shards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""
+SQLite Session Store
+Materializes sessions, speakers, keywords, personas and exhibitors from the
+JSON datasets into one normalized SQLite database, and reads them back.
+
+The database replaces "parse a whole JSON array to answer one question":
+sessions are indexed on date / venue / room / session_type, text fields are
+searchable through an FTS5 table, and the dedupe and heavy-hitter checks
+run as indexed queries.
+
+Usage:
+    python session_db.py export                 # JSON datasets -> summit.db
+    python session_db.py import enriched out.json
+    python session_db.py dedupe [dataset]
+    python session_db.py heavy-hitters [dataset]
+    python session_db.py search "Sundar Pichai" [dataset]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "3-deduplication"))
+from artifacts import write_artifact  # noqa: E402
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+DB_PATH = os.path.join(DATA_DIR, "production", "summit.db")
+
+# dataset label -> source file (relative to data/)
+SESSION_DATASETS = {
+    "raw": "raw/sessions.json",
+    "enriched": "enriched/sessions_enriched.json",
+    "merged_v2": "enriched/events_merged_v2.json",
+    "production": "production/events.json",
+}
+EXHIBITOR_DATASETS = {
+    "production": "production/exhibitors.json",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    pk INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id INTEGER,
+    event_id TEXT,
+    title TEXT,
+    description TEXT,
+    date TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    venue TEXT,
+    room TEXT,
+    session_type TEXT,
+    speakers TEXT,
+    knowledge_partners TEXT,
+    summary_one_liner TEXT,
+    technical_depth INTEGER,
+    is_heavy_hitter INTEGER NOT NULL DEFAULT 0,
+    decision_maker_density TEXT,
+    investor_presence TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_dataset_id ON sessions(dataset, id);
+CREATE INDEX IF NOT EXISTS idx_sessions_dataset_event_id ON sessions(dataset, event_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(dataset, date, start_time);
+CREATE INDEX IF NOT EXISTS idx_sessions_venue ON sessions(dataset, venue);
+CREATE INDEX IF NOT EXISTS idx_sessions_room ON sessions(dataset, room);
+CREATE INDEX IF NOT EXISTS idx_sessions_session_type ON sessions(dataset, session_type);
+CREATE INDEX IF NOT EXISTS idx_sessions_heavy_hitter ON sessions(dataset, is_heavy_hitter, date);
+
+CREATE TABLE IF NOT EXISTS speakers (
+    speaker_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS session_speakers (
+    session_pk INTEGER NOT NULL REFERENCES sessions(pk),
+    speaker_id INTEGER NOT NULL REFERENCES speakers(speaker_id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (session_pk, position)
+);
+CREATE INDEX IF NOT EXISTS idx_session_speakers_speaker ON session_speakers(speaker_id);
+
+CREATE TABLE IF NOT EXISTS keywords (
+    keyword_id INTEGER PRIMARY KEY,
+    keyword TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    UNIQUE (keyword, category)
+);
+CREATE TABLE IF NOT EXISTS session_keywords (
+    session_pk INTEGER NOT NULL REFERENCES sessions(pk),
+    keyword_id INTEGER NOT NULL REFERENCES keywords(keyword_id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (session_pk, position)
+);
+CREATE INDEX IF NOT EXISTS idx_session_keywords_keyword ON session_keywords(keyword_id);
+
+CREATE TABLE IF NOT EXISTS personas (
+    persona_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS session_personas (
+    session_pk INTEGER NOT NULL REFERENCES sessions(pk),
+    persona_id INTEGER NOT NULL REFERENCES personas(persona_id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (session_pk, position)
+);
+CREATE INDEX IF NOT EXISTS idx_session_personas_persona ON session_personas(persona_id);
+
+CREATE TABLE IF NOT EXISTS exhibitors (
+    pk INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id INTEGER,
+    name TEXT,
+    logo_url TEXT,
+    one_liner TEXT,
+    networking_tip TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_exhibitors_dataset_id ON exhibitors(dataset, id);
+CREATE TABLE IF NOT EXISTS exhibitor_keywords (
+    exhibitor_pk INTEGER NOT NULL REFERENCES exhibitors(pk),
+    keyword_id INTEGER NOT NULL REFERENCES keywords(keyword_id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (exhibitor_pk, position)
+);
+CREATE TABLE IF NOT EXISTS exhibitor_personas (
+    exhibitor_pk INTEGER NOT NULL REFERENCES exhibitors(pk),
+    persona_id INTEGER NOT NULL REFERENCES personas(persona_id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (exhibitor_pk, position)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts USING fts5(
+    title, description, speakers, knowledge_partners, summary_one_liner,
+    content='sessions', content_rowid='pk'
+);
+"""
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Open the store and make sure the schema exists."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def split_names(value) -> list:
+    """Speakers/partners are '; '-joined strings in the CMS scrape, lists elsewhere."""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [v.strip() for v in value if v and v.strip()]
+    return [v.strip() for v in value.split(";") if v.strip()]
+
+
+def keyword_pair(keyword) -> tuple:
+    """Enriched keywords are plain strings, production ones are {category, keyword}."""
+    if isinstance(keyword, dict):
+        return (keyword.get("keyword", ""), keyword.get("category") or "")
+    return (keyword, "")
+
+
+def _lookup_ids(conn, table: str, id_col: str, key_cols: tuple, keys: set) -> dict:
+    """Insert any missing dimension rows in one executemany and return key -> id."""
+    placeholders = ", ".join("?" for _ in key_cols)
+    cols = ", ".join(key_cols)
+    conn.executemany(f"INSERT OR IGNORE INTO {table} ({cols}) VALUES ({placeholders})",
+                     [k if isinstance(k, tuple) else (k,) for k in keys])
+    ids = {}
+    for row in conn.execute(f"SELECT {id_col}, {cols} FROM {table}"):
+        key = tuple(row[c] for c in key_cols)
+        ids[key if len(key) > 1 else key[0]] = row[id_col]
+    return ids
+
+
+def _delete_dataset(conn, table: str, dataset: str, link_tables: list):
+    pk_query = f"SELECT pk FROM {table} WHERE dataset = ?"
+    for link_table, fk in link_tables:
+        conn.execute(f"DELETE FROM {link_table} WHERE {fk} IN ({pk_query})", (dataset,))
+    conn.execute(f"DELETE FROM {table} WHERE dataset = ?", (dataset,))
+
+
+def load_sessions(conn, dataset: str, sessions: list) -> int:
+    """Bulk-load one session dataset, replacing any previous copy of it.
+
+    Everything happens in a single transaction with executemany, so a
+    half-written dataset is never visible.
+    """
+    with conn:
+        _delete_dataset(conn, "sessions", dataset, [
+            ("session_speakers", "session_pk"),
+            ("session_keywords", "session_pk"),
+            ("session_personas", "session_pk"),
+        ])
+
+        speaker_names = set()
+        keyword_keys = set()
+        persona_names = set()
+        for s in sessions:
+            speaker_names.update(split_names(s.get("speakers")))
+            keyword_keys.update(keyword_pair(k) for k in s.get("keywords") or [])
+            persona_names.update(s.get("target_personas") or [])
+
+        speaker_ids = _lookup_ids(conn, "speakers", "speaker_id", ("name",), speaker_names)
+        keyword_ids = _lookup_ids(conn, "keywords", "keyword_id", ("keyword", "category"), keyword_keys)
+        persona_ids = _lookup_ids(conn, "personas", "persona_id", ("name",), persona_names)
+
+        start_pk = conn.execute("SELECT COALESCE(MAX(pk), 0) FROM sessions").fetchone()[0] + 1
+        session_rows = []
+        speaker_links = []
+        keyword_links = []
+        persona_links = []
+
+        for position, s in enumerate(sessions):
+            pk = start_pk + position
+            signals = s.get("networking_signals") or {}
+            speakers = split_names(s.get("speakers"))
+            session_rows.append((
+                pk, dataset, position, s.get("id"), s.get("event_id"),
+                s.get("title"), s.get("description"), s.get("date"),
+                s.get("start_time"), s.get("end_time"), s.get("venue"),
+                s.get("room"), s.get("session_type"), "; ".join(speakers),
+                "; ".join(split_names(s.get("knowledge_partners"))),
+                s.get("summary_one_liner"), s.get("technical_depth"),
+                1 if signals.get("is_heavy_hitter") else 0,
+                signals.get("decision_maker_density"),
+                signals.get("investor_presence"),
+                json.dumps(s, ensure_ascii=False),
+            ))
+            speaker_links.extend((pk, speaker_ids[name], i) for i, name in enumerate(speakers))
+            keyword_links.extend((pk, keyword_ids[keyword_pair(k)], i)
+                                 for i, k in enumerate(s.get("keywords") or []))
+            persona_links.extend((pk, persona_ids[p], i)
+                                 for i, p in enumerate(s.get("target_personas") or []))
+
+        conn.executemany(
+            "INSERT INTO sessions (pk, dataset, position, id, event_id, title, description, date, "
+            "start_time, end_time, venue, room, session_type, speakers, knowledge_partners, "
+            "summary_one_liner, technical_depth, is_heavy_hitter, decision_maker_density, "
+            "investor_presence, record) VALUES (" + ", ".join("?" * 21) + ")",
+            session_rows,
+        )
+        conn.executemany("INSERT INTO session_speakers VALUES (?, ?, ?)", speaker_links)
+        conn.executemany("INSERT INTO session_keywords VALUES (?, ?, ?)", keyword_links)
+        conn.executemany("INSERT INTO session_personas VALUES (?, ?, ?)", persona_links)
+        # External-content FTS table: rebuild once after the bulk insert
+        conn.execute("INSERT INTO sessions_fts(sessions_fts) VALUES ('rebuild')")
+
+    return len(session_rows)
+
+
+def load_exhibitors(conn, dataset: str, exhibitors: list) -> int:
+    """Bulk-load one exhibitor dataset, replacing any previous copy of it."""
+    with conn:
+        _delete_dataset(conn, "exhibitors", dataset, [
+            ("exhibitor_keywords", "exhibitor_pk"),
+            ("exhibitor_personas", "exhibitor_pk"),
+        ])
+
+        keyword_keys = set()
+        persona_names = set()
+        for e in exhibitors:
+            keyword_keys.update(keyword_pair(k) for k in e.get("keywords") or [])
+            persona_names.update(e.get("target_personas") or [])
+        keyword_ids = _lookup_ids(conn, "keywords", "keyword_id", ("keyword", "category"), keyword_keys)
+        persona_ids = _lookup_ids(conn, "personas", "persona_id", ("name",), persona_names)
+
+        start_pk = conn.execute("SELECT COALESCE(MAX(pk), 0) FROM exhibitors").fetchone()[0] + 1
+        rows = []
+        keyword_links = []
+        persona_links = []
+        for position, e in enumerate(exhibitors):
+            pk = start_pk + position
+            rows.append((pk, dataset, position, e.get("id"), e.get("name"), e.get("logo_url"),
+                         e.get("one_liner"), e.get("networking_tip"),
+                         json.dumps(e, ensure_ascii=False)))
+            keyword_links.extend((pk, keyword_ids[keyword_pair(k)], i)
+                                 for i, k in enumerate(e.get("keywords") or []))
+            persona_links.extend((pk, persona_ids[p], i)
+                                 for i, p in enumerate(e.get("target_personas") or []))
+
+        conn.executemany("INSERT INTO exhibitors VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.executemany("INSERT INTO exhibitor_keywords VALUES (?, ?, ?)", keyword_links)
+        conn.executemany("INSERT INTO exhibitor_personas VALUES (?, ?, ?)", persona_links)
+
+    return len(rows)
+
+
+def read_sessions(conn, dataset: str) -> list:
+    """Import path: rebuild the original JSON array for a dataset, in order."""
+    return [json.loads(row["record"]) for row in conn.execute(
+        "SELECT record FROM sessions WHERE dataset = ? ORDER BY position", (dataset,))]
+
+
+def read_exhibitors(conn, dataset: str) -> list:
+    return [json.loads(row["record"]) for row in conn.execute(
+        "SELECT record FROM exhibitors WHERE dataset = ? ORDER BY position", (dataset,))]
+
+
+def find_duplicates(conn, dataset: str, key: str = "id") -> list:
+    """Ids (or event_ids) that occur more than once, with every occurrence.
+
+    Same first-occurrence-wins rule as dedupe_final.py, but answered from
+    the (dataset, id) index instead of a full scan.
+    """
+    if key not in ("id", "event_id"):
+        raise ValueError(f"Unsupported dedupe key: {key}")
+    dupes = conn.execute(
+        f"SELECT {key} AS key, COUNT(*) AS n, MIN(position) AS kept_position FROM sessions "
+        f"WHERE dataset = ? AND {key} IS NOT NULL GROUP BY {key} HAVING n > 1 ORDER BY {key}",
+        (dataset,),
+    ).fetchall()
+    result = []
+    for row in dupes:
+        removed = conn.execute(
+            f"SELECT position, id, event_id, title FROM sessions "
+            f"WHERE dataset = ? AND {key} = ? AND position != ? ORDER BY position",
+            (dataset, row["key"], row["kept_position"]),
+        ).fetchall()
+        result.append({
+            "key": row["key"],
+            "count": row["n"],
+            "kept_position": row["kept_position"],
+            "removed": [dict(r) for r in removed],
+        })
+    return result
+
+
+def deduplicated_sessions(conn, dataset: str, key: str = "id") -> list:
+    """Sessions with duplicates removed, keeping the first occurrence."""
+    if key not in ("id", "event_id"):
+        raise ValueError(f"Unsupported dedupe key: {key}")
+    return [json.loads(row["record"]) for row in conn.execute(
+        f"SELECT record FROM sessions WHERE dataset = ? AND (position IN ("
+        f"  SELECT MIN(position) FROM sessions WHERE dataset = ? AND {key} IS NOT NULL GROUP BY {key}"
+        f") OR {key} IS NULL) ORDER BY position",
+        (dataset, dataset),
+    )]
+
+
+def heavy_hitters(conn, dataset: str) -> list:
+    """Heavy hitter sessions, ordered by date and start time."""
+    return [dict(row) for row in conn.execute(
+        "SELECT id, title, date, start_time, venue, room FROM sessions "
+        "WHERE dataset = ? AND is_heavy_hitter = 1 ORDER BY date, start_time",
+        (dataset,),
+    )]
+
+
+def heavy_hitter_overlaps(conn, dataset: str) -> dict:
+    """(date, HH:MM) slots holding more than one heavy hitter."""
+    overlaps = {}
+    for row in conn.execute(
+        "SELECT date, substr(start_time, 1, 5) AS slot, COUNT(*) AS n FROM sessions "
+        "WHERE dataset = ? AND is_heavy_hitter = 1 GROUP BY date, slot HAVING n > 1",
+        (dataset,),
+    ):
+        overlaps[(row["date"], row["slot"])] = [dict(r) for r in conn.execute(
+            "SELECT id, title FROM sessions WHERE dataset = ? AND is_heavy_hitter = 1 "
+            "AND date = ? AND substr(start_time, 1, 5) = ?",
+            (dataset, row["date"], row["slot"]),
+        )]
+    return overlaps
+
+
+def search(conn, query: str, dataset: str = None, columns: tuple = None, limit: int = 50) -> list:
+    """Full-text search over session text fields.
+
+    `query` is treated as a phrase; pass `columns` (e.g. ("title", "speakers"))
+    to restrict the match the way fix_heavy_hitters.py restricts VIP names.
+    """
+    phrase = '"' + query.replace('"', '""') + '"'
+    if columns:
+        phrase = "{" + " ".join(columns) + "} : " + phrase
+    sql = ("SELECT s.id, s.dataset, s.title, s.date, s.start_time, s.speakers "
+           "FROM sessions_fts JOIN sessions s ON s.pk = sessions_fts.rowid "
+           "WHERE sessions_fts MATCH ?")
+    params = [phrase]
+    if dataset:
+        sql += " AND s.dataset = ?"
+        params.append(dataset)
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def export_all(conn):
+    """Load every known JSON dataset that exists on disk."""
+    for dataset, rel_path in SESSION_DATASETS.items():
+        path = os.path.join(DATA_DIR, rel_path)
+        if not os.path.exists(path):
+            print(f"  - {dataset}: {rel_path} not found, skipped")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            count = load_sessions(conn, dataset, json.load(f))
+        print(f"  ✓ sessions/{dataset}: {count} rows from {rel_path}")
+
+    for dataset, rel_path in EXHIBITOR_DATASETS.items():
+        path = os.path.join(DATA_DIR, rel_path)
+        if not os.path.exists(path):
+            print(f"  - exhibitors/{dataset}: {rel_path} not found, skipped")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            count = load_exhibitors(conn, dataset, json.load(f))
+        print(f"  ✓ exhibitors/{dataset}: {count} rows from {rel_path}")
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else "export"
+    conn = connect()
+
+    if command == "export":
+        print("=" * 70)
+        print(f"EXPORTING JSON DATASETS -> {DB_PATH}")
+        print("=" * 70)
+        export_all(conn)
+        for table in ("sessions", "speakers", "keywords", "personas", "exhibitors"):
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            print(f"  {table}: {count}")
+
+    elif command == "import":
+        if len(args) < 3:
+            print("Usage: python session_db.py import <dataset> <output.json>")
+            return
+        dataset, output_file = args[1], args[2]
+        sessions = read_sessions(conn, dataset)
+        # Row order is the original file order; keep it for the round trip
+        write_artifact(output_file, sessions, sort_by=None)
+        print(f"✓ Wrote {len(sessions)} sessions from '{dataset}' to {output_file}")
+
+    elif command == "dedupe":
+        dataset = args[1] if len(args) > 1 else "enriched"
+        dupes = find_duplicates(conn, dataset)
+        total = conn.execute("SELECT COUNT(*) FROM sessions WHERE dataset = ?", (dataset,)).fetchone()[0]
+        removed = sum(d["count"] - 1 for d in dupes)
+        print(f"Dataset '{dataset}': {total} sessions, {len(dupes)} duplicated ids, "
+              f"{removed} rows would be removed")
+        for d in dupes:
+            print(f"  - ID {d['key']}: appears {d['count']} times")
+
+    elif command == "heavy-hitters":
+        dataset = args[1] if len(args) > 1 else "enriched"
+        rows = heavy_hitters(conn, dataset)
+        print(f"Heavy hitters in '{dataset}': {len(rows)}")
+        for r in rows:
+            print(f"  {r['date']} {(r['start_time'] or '')[:5]} - {r['title'][:60]}")
+        overlaps = heavy_hitter_overlaps(conn, dataset)
+        if overlaps:
+            print(f"\n⚠️  {len(overlaps)} time slots have multiple heavy hitters")
+            for (date, slot), events in sorted(overlaps.items()):
+                print(f"  {date} at {slot}: " + ", ".join(str(e["id"]) for e in events))
+
+    elif command == "search":
+        if len(args) < 2:
+            print('Usage: python session_db.py search "<phrase>" [dataset]')
+            return
+        dataset = args[2] if len(args) > 2 else None
+        for r in search(conn, args[1], dataset):
+            print(f"  [{r['dataset']}] ID {r['id']}: {r['title'][:60]} ({r['date']})")
+
+    else:
+        print(__doc__)
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
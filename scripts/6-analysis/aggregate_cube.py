@@ -0,0 +1,301 @@
+"""
+Aggregate Cube for Catalogue Statistics
+Computes session counts over date x venue x session_type x heavy_hitter x
+persona x keyword category once per data version, so summary printers and
+metadata.json read tallies from the cube instead of rescanning records.
+
+Personas and keyword categories are multi-valued, so the cube keeps one
+cuboid per combination of them (none / persona / category / both). Each
+cuboid counts a session once per cell, which keeps "sessions per persona"
+correct without double counting in the plain date/venue rollups.
+
+Usage:
+    python aggregate_cube.py                    # build cubes for production data
+    python aggregate_cube.py metadata           # refresh data/production/metadata.json from cubes
+    python aggregate_cube.py rollup events date venue
+"""
+
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+from itertools import product
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "3-deduplication"))
+from artifacts import write_artifact  # noqa: E402
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+CUBE_DIR = os.path.join(DATA_DIR, "cubes")
+METADATA_PATH = os.path.join(DATA_DIR, "production", "metadata.json")
+KEYWORD_TAXONOMY_PATH = os.path.join(DATA_DIR, "taxonomies", "keyword_taxonomy_100.json")
+
+# cube name -> source file (relative to data/)
+SOURCES = {
+    "events": "production/events.json",
+    "exhibitors": "production/exhibitors.json",
+}
+
+SCALAR_DIMENSIONS = ("date", "venue", "session_type", "heavy_hitter")
+MULTI_DIMENSIONS = ("persona", "keyword_category")
+MEASURES = ("count", "keywords", "personas")
+
+_keyword_categories = None
+
+
+def keyword_category(keyword) -> str:
+    """Category of a keyword: production keywords carry it, raw ones go via the taxonomy."""
+    global _keyword_categories
+    if isinstance(keyword, dict):
+        return keyword.get("category")
+    if _keyword_categories is None:
+        _keyword_categories = {}
+        if os.path.exists(KEYWORD_TAXONOMY_PATH):
+            with open(KEYWORD_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+                mappings = json.load(f)["mappings"]
+            to_category = mappings["keyword_to_category"]
+            for original, consolidated in mappings["original_to_consolidated"].items():
+                _keyword_categories[original] = to_category.get(consolidated)
+    return _keyword_categories.get((keyword or "").lower().strip())
+
+
+def coordinates(record: dict) -> tuple:
+    """(scalar coordinate tuple, {multi dimension: sorted distinct values}) for one record."""
+    signals = record.get("networking_signals") or {}
+    scalars = (
+        record.get("date"),
+        record.get("venue"),
+        record.get("session_type"),
+        bool(signals.get("is_heavy_hitter")),
+    )
+    keywords = record.get("keywords") or []
+    multi = {
+        "persona": sorted(set(record.get("target_personas") or [])),
+        "keyword_category": sorted({c for c in (keyword_category(k) for k in keywords) if c}),
+    }
+    return scalars, multi
+
+
+def hash_file(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _cuboid_name(multi_dims: tuple) -> str:
+    return "+".join(multi_dims)
+
+
+CUBOIDS = [(), ("persona",), ("keyword_category",), ("persona", "keyword_category")]
+
+
+class Cube:
+    """Counts per cell for every cuboid; cells are keyed by coordinate tuples."""
+
+    def __init__(self, version: str = None):
+        self.version = version
+        # cuboid multi dims -> {scalar coords + multi coords: [count, keywords, personas]}
+        self.cells = {dims: {} for dims in CUBOIDS}
+
+    def _contributions(self, record: dict):
+        scalars, multi = coordinates(record)
+        measures = (1, len(record.get("keywords") or []), len(record.get("target_personas") or []))
+        for dims in CUBOIDS:
+            for combo in product(*(multi[d] for d in dims)):
+                yield dims, scalars + combo, measures
+
+    def _apply(self, record: dict, sign: int):
+        for dims, key, measures in self._contributions(record):
+            cuboid = self.cells[dims]
+            cell = cuboid.setdefault(key, [0, 0, 0])
+            for i, m in enumerate(measures):
+                cell[i] += sign * m
+            if cell[0] <= 0:
+                del cuboid[key]
+
+    def add(self, record: dict):
+        self._apply(record, 1)
+
+    def remove(self, record: dict):
+        self._apply(record, -1)
+
+    def update(self, old_records: list, new_records: list):
+        """Incremental refresh: retract the old versions of changed records, add the new ones."""
+        for record in old_records:
+            self.remove(record)
+        for record in new_records:
+            self.add(record)
+
+    @classmethod
+    def build(cls, records: list, version: str = None) -> "Cube":
+        cube = cls(version)
+        for record in records:
+            cube.add(record)
+        return cube
+
+    def rollup(self, group_by: list, where: dict = None, measure: str = "count") -> Counter:
+        """Aggregate `measure` grouped by dimensions, filtered by {dim: value or set}.
+
+        Uses the smallest cuboid that contains every multi-valued dimension
+        mentioned, so grouping by date alone never double counts sessions.
+        """
+        where = where or {}
+        wanted = set(group_by) | set(where)
+        unknown = wanted - set(SCALAR_DIMENSIONS) - set(MULTI_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimensions: {sorted(unknown)}")
+        dims = tuple(d for d in MULTI_DIMENSIONS if d in wanted)
+        names = SCALAR_DIMENSIONS + dims
+        group_idx = [names.index(d) for d in group_by]
+        filters = [(names.index(d), v if isinstance(v, (set, frozenset, list, tuple)) else {v})
+                   for d, v in where.items()]
+        measure_idx = MEASURES.index(measure)
+
+        result = Counter()
+        for key, cell in self.cells[dims].items():
+            if all(key[i] in values for i, values in filters):
+                group = tuple(key[i] for i in group_idx)
+                result[group[0] if len(group) == 1 else group] += cell[measure_idx]
+        return result
+
+    def total(self, measure: str = "count", where: dict = None) -> int:
+        return sum(self.rollup([], where, measure).values())
+
+    def to_dict(self) -> dict:
+        """Compact form: per-dimension dictionaries plus integer-coded cells."""
+        names = SCALAR_DIMENSIONS + MULTI_DIMENSIONS
+        values = {name: set() for name in names}
+        for dims, cuboid in self.cells.items():
+            for key in cuboid:
+                for name, v in zip(SCALAR_DIMENSIONS + dims, key):
+                    values[name].add(v)
+        dictionaries = {name: sorted(vals, key=lambda v: (v is None, str(v))) for name, vals in values.items()}
+        codes = {name: {v: i for i, v in enumerate(vals)} for name, vals in dictionaries.items()}
+
+        cuboids = {}
+        for dims, cuboid in self.cells.items():
+            dim_names = SCALAR_DIMENSIONS + dims
+            cuboids[_cuboid_name(dims)] = sorted(
+                [codes[n][v] for n, v in zip(dim_names, key)] + cell
+                for key, cell in cuboid.items()
+            )
+        return {
+            "version": self.version,
+            "scalar_dimensions": list(SCALAR_DIMENSIONS),
+            "multi_dimensions": list(MULTI_DIMENSIONS),
+            "measures": list(MEASURES),
+            "dictionaries": dictionaries,
+            "cuboids": cuboids,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Cube":
+        cube = cls(data.get("version"))
+        dictionaries = data["dictionaries"]
+        for dims in CUBOIDS:
+            dim_names = SCALAR_DIMENSIONS + dims
+            width = len(dim_names)
+            cuboid = cube.cells[dims]
+            for row in data["cuboids"].get(_cuboid_name(dims), []):
+                key = tuple(dictionaries[n][c] for n, c in zip(dim_names, row[:width]))
+                cuboid[key] = list(row[width:])
+        return cube
+
+    def save(self, path: str):
+        write_artifact(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str) -> "Cube":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def load_or_build(name: str) -> Cube:
+    """Cube for a source dataset, rebuilt only when the source file's hash changes."""
+    source_path = os.path.join(DATA_DIR, SOURCES[name])
+    cube_path = os.path.join(CUBE_DIR, f"{name}.json")
+    version = hash_file(source_path)
+    if os.path.exists(cube_path):
+        cube = Cube.load(cube_path)
+        if cube.version == version:
+            return cube
+    with open(source_path, "r", encoding="utf-8") as f:
+        cube = Cube.build(json.load(f), version)
+    cube.save(cube_path)
+    return cube
+
+
+def print_summary(cube: Cube):
+    """The SESSIONS BY DATE / BY VENUE summary printed after each scrape."""
+    print("\n" + "=" * 60)
+    print("SESSIONS BY DATE:")
+    print("=" * 60)
+    for date, count in sorted(cube.rollup(["date"]).items(), key=lambda x: str(x[0])):
+        print(f"  {date}: {count} sessions")
+
+    print("\n" + "=" * 60)
+    print("SESSIONS BY VENUE:")
+    print("=" * 60)
+    venue_counts = cube.rollup(["venue"])
+    for venue, count in sorted(venue_counts.items(), key=lambda x: -x[1]):
+        if venue:
+            print(f"  {venue}: {count} sessions")
+
+
+def metadata_data_section(events: Cube, exhibitors: Cube) -> dict:
+    """The `data` block of metadata.json (averages formatted like toFixed(1))."""
+    def average(cube, measure):
+        total = cube.total()
+        return f"{cube.total(measure) / total:.1f}" if total else "0.0"
+
+    return {
+        "events": {
+            "total": events.total(),
+            "avg_keywords_per_event": average(events, "keywords"),
+            "avg_personas_per_event": average(events, "personas"),
+        },
+        "exhibitors": {
+            "total": exhibitors.total(),
+            "avg_keywords_per_exhibitor": average(exhibitors, "keywords"),
+            "avg_personas_per_exhibitor": average(exhibitors, "personas"),
+        },
+    }
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else "build"
+
+    if command == "build":
+        print("=" * 70)
+        print(f"BUILDING AGGREGATE CUBES -> {CUBE_DIR}")
+        print("=" * 70)
+        for name in SOURCES:
+            cube = load_or_build(name)
+            cells = sum(len(c) for c in cube.cells.values())
+            print(f"  ✓ {name}: {cube.total()} records, {cells} cells (version {cube.version[:12]})")
+
+    elif command == "metadata":
+        with open(METADATA_PATH, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        metadata["data"] = metadata_data_section(load_or_build("events"), load_or_build("exhibitors"))
+        write_artifact(METADATA_PATH, metadata)
+        print(f"✓ Updated data section of {METADATA_PATH}")
+        print(json.dumps(metadata["data"], indent=2))
+
+    elif command == "rollup":
+        if len(args) < 3:
+            print("Usage: python aggregate_cube.py rollup <cube> <dim> [<dim> ...]")
+            return
+        cube = load_or_build(args[1])
+        for group, count in sorted(cube.rollup(args[2:]).items(), key=lambda x: -x[1]):
+            print(f"  {group}: {count}")
+
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
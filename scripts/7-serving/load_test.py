@@ -0,0 +1,129 @@
+"""
+Load Test for the Production Data Read API
+Drives serve_data.py with concurrent keep-alive clients and reports
+throughput, latency percentiles and the status mix (200 vs 304).
+
+Usage:
+    python load_test.py                          # starts an in-process server on a free port
+    python load_test.py --url http://127.0.0.1:8765 --clients 50 --requests 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from serve_data import DataServer
+
+PATHS = [
+    "/events",
+    "/exhibitors",
+    "/events?date=2026-02-19",
+    "/events?date=2026-02-20",
+    "/events?date=2026-02-19&venue=Bharat%20Mandapam",
+    "/events?ids=4598,4601,4602",
+    "/exhibitors?ids=1,2,3,4,5",
+]
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return status, headers, body
+
+
+async def client(host: str, port: int, requests: int, revalidate: float, gzip: bool,
+                 latencies: list, statuses: Counter, byte_counter: list):
+    """One keep-alive connection; remembers ETags and revalidates a share of requests."""
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        for _ in range(requests):
+            path = random.choice(PATHS)
+            lines = [f"GET {path} HTTP/1.1", f"Host: {host}"]
+            if gzip:
+                lines.append("Accept-Encoding: gzip")
+            if path in etags and random.random() < revalidate:
+                lines.append(f"If-None-Match: {etags[path]}")
+            start = time.perf_counter()
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            await writer.drain()
+            status, headers, body = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+            byte_counter[0] += len(body)
+            if "etag" in headers:
+                etags[path] = headers["etag"]
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run(url: str, clients: int, requests: int, revalidate: float, gzip: bool):
+    server = None
+    if url:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        data_server = DataServer()
+        server = await data_server.start("127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Started in-process server on {host}:{port}")
+
+    latencies = []
+    statuses = Counter()
+    byte_counter = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, revalidate, gzip, latencies, statuses, byte_counter)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    if server:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    total = len(latencies)
+    print("\n" + "=" * 60)
+    print("LOAD TEST RESULTS")
+    print("=" * 60)
+    print(f"Clients: {clients}  Requests/client: {requests}  gzip: {gzip}  revalidate: {revalidate:.0%}")
+    print(f"Total requests: {total} in {elapsed:.2f}s -> {total / elapsed:,.0f} req/s")
+    print(f"Transferred: {byte_counter[0] / 1e6:,.1f} MB ({byte_counter[0] / 1e6 / elapsed:,.1f} MB/s)")
+    print(f"Latency p50: {percentile(latencies, 50) * 1000:.2f} ms  "
+          f"p95: {percentile(latencies, 95) * 1000:.2f} ms  "
+          f"p99: {percentile(latencies, 99) * 1000:.2f} ms")
+    print("Statuses: " + ", ".join(f"{s}: {n}" for s, n in sorted(statuses.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for serve_data.py")
+    parser.add_argument("--url", help="running server (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=100, help="requests per client")
+    parser.add_argument("--revalidate", type=float, default=0.5,
+                        help="share of repeat requests sent with If-None-Match")
+    parser.add_argument("--no-gzip", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.clients, args.requests, args.revalidate, not args.no_gzip))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Room x Time Occupancy Index
+Answers "what is live now", "what starts next" and "which rooms are free"
+for the ops desk without scanning every session or re-parsing start_time
+strings per query.
+
+Sessions are grouped per (date, venue, room) into a timeline of sorted
+start minutes, end minutes and a running maximum of the ends, so each
+query is a bisect per room. Most CMS sessions have no end_time; those end
+DEFAULT_DURATION minutes after they start, or when the next session in the
+same room starts, whichever is earlier.
+
+The index updates in place from a session_diff.py changeset, so a rescrape
+only touches the rooms whose sessions were added, removed or moved.
+
+Usage:
+    python occupancy_index.py now  --date 2026-02-19 --time 10:15 [--venue "Bharat Mandapam"]
+    python occupancy_index.py next --date 2026-02-19 --time 10:15 [--room "Plenary Hall"]
+    python occupancy_index.py free --date 2026-02-19 --time 10:15 [--until 11:30]
+    python occupancy_index.py bench [--data FILE]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from bisect import bisect_left, bisect_right, insort
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "3-deduplication"))
+from session_diff import MISSING  # noqa: E402
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+EVENTS_PATH = os.path.join(DATA_DIR, "production", "events.json")
+
+DEFAULT_DURATION = 60
+
+# Fields that decide where a session sits in the index
+SLOT_FIELDS = ("date", "start_time", "end_time", "venue", "room")
+
+
+def to_minutes(value):
+    """'09:30:00.000' / '9:30' / 570 -> minutes since midnight (None if unparseable)."""
+    if isinstance(value, int):
+        return value
+    match = re.match(r"\s*(\d{1,2}):(\d{2})", str(value or ""))
+    return int(match.group(1)) * 60 + int(match.group(2)) if match else None
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class RoomTimeline:
+    """Sessions of one room on one day, ordered by start minute."""
+
+    __slots__ = ("starts", "declared_ends", "ends", "max_ends", "ids")
+
+    def __init__(self):
+        self.starts = []
+        self.declared_ends = []   # end_time from the data, or None
+        self.ends = []            # effective end (declared or inferred)
+        self.max_ends = []        # max(ends[:i + 1]), so overlaps are found by bisect too
+        self.ids = []
+
+    def insert(self, start: int, end, session_id):
+        # Same start: order by id, so the layout doesn't depend on insertion order
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start and str(self.ids[i]) < str(session_id):
+            i += 1
+        self.starts.insert(i, start)
+        self.declared_ends.insert(i, end)
+        self.ids.insert(i, session_id)
+        self._refresh()
+
+    def remove(self, session_id) -> bool:
+        try:
+            i = self.ids.index(session_id)
+        except ValueError:
+            return False
+        for column in (self.starts, self.declared_ends, self.ids):
+            del column[i]
+        self._refresh()
+        return True
+
+    def _refresh(self):
+        """Recompute inferred ends; rooms hold a handful of sessions a day."""
+        self.ends = []
+        self.max_ends = []
+        running = -1
+        for i, start in enumerate(self.starts):
+            end = self.declared_ends[i]
+            if end is None or end <= start:
+                end = start + DEFAULT_DURATION
+                j = bisect_right(self.starts, start, i + 1)
+                if j < len(self.starts):
+                    end = min(end, self.starts[j])
+            running = max(running, end)
+            self.ends.append(end)
+            self.max_ends.append(running)
+
+    def live(self, minute: int) -> list:
+        """Indexes of sessions with start <= minute < end."""
+        found = []
+        i = bisect_right(self.starts, minute) - 1
+        while i >= 0 and self.max_ends[i] > minute:
+            if self.ends[i] > minute:
+                found.append(i)
+            i -= 1
+        return found[::-1]
+
+    def next_after(self, minute: int):
+        """Index of the first session starting after minute, or None."""
+        i = bisect_right(self.starts, minute)
+        return i if i < len(self.starts) else None
+
+    def is_free(self, start: int, until: int) -> bool:
+        """No session overlaps [start, until)."""
+        i = bisect_left(self.starts, until) - 1
+        return i < 0 or self.max_ends[i] <= start
+
+    def __len__(self):
+        return len(self.starts)
+
+
+class OccupancyIndex:
+    def __init__(self):
+        self.rooms = {}      # (date, venue, room) -> RoomTimeline
+        self.by_date = {}    # date -> sorted room keys
+        self.sessions = {}   # id -> session record (own copy)
+        self.unplaced = set()
+
+    @classmethod
+    def build(cls, sessions: list) -> "OccupancyIndex":
+        """Index sessions by id; repeated ids keep their first record (as the dedupe scripts do)."""
+        index = cls()
+        for session in sessions:
+            if session.get("id") not in index.sessions:
+                index.add(session)
+        return index
+
+    @staticmethod
+    def slot(session: dict):
+        """((date, venue, room), start, end) or None if the session has no date/start."""
+        start = to_minutes(session.get("start_time"))
+        if not session.get("date") or start is None:
+            return None
+        key = (session["date"], session.get("venue") or "", session.get("room") or "")
+        return key, start, to_minutes(session.get("end_time"))
+
+    def add(self, session: dict):
+        session = dict(session)
+        self.sessions[session.get("id")] = session
+        slot = self.slot(session)
+        if slot is None:
+            self.unplaced.add(session.get("id"))
+            return
+        key, start, end = slot
+        timeline = self.rooms.get(key)
+        if timeline is None:
+            timeline = self.rooms[key] = RoomTimeline()
+            insort(self.by_date.setdefault(key[0], []), key)
+        timeline.insert(start, end, session.get("id"))
+
+    def remove(self, session_id) -> dict:
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return None
+        self.unplaced.discard(session_id)
+        slot = self.slot(session)
+        if slot is not None:
+            key = slot[0]
+            timeline = self.rooms[key]
+            timeline.remove(session_id)
+            if not timeline:
+                del self.rooms[key]
+                self.by_date[key[0]].remove(key)
+        return session
+
+    def apply_changes(self, changeset: dict) -> list:
+        """Apply a session_diff.diff_collections(..., key="id") changeset.
+
+        Only sessions whose slot fields changed are re-placed; other field
+        changes just update the stored record. Returns one entry per added,
+        removed or moved session. Repeated-id keys ((id, n) tuples) are
+        ignored, matching build().
+        """
+        moves = []
+        for entry in changeset["removed"]:
+            if isinstance(entry["key"], tuple):
+                continue
+            old = self.remove(entry["key"])
+            if old is not None:
+                moves.append({"kind": "removed", "id": entry["key"], "title": old.get("title"),
+                              "from": self._where(old), "to": None})
+        for entry in changeset["added"]:
+            if isinstance(entry["key"], tuple):
+                continue
+            self.add(entry["record"])
+            moves.append({"kind": "added", "id": entry["key"], "title": entry["record"].get("title"),
+                          "from": None, "to": self._where(entry["record"])})
+        for entry in changeset["changed"]:
+            session = self.sessions.get(entry["key"])
+            if session is None:
+                continue
+            updated = dict(session)
+            for field, change in entry["fields"].items():
+                if "new" in change and "." not in field and "[" not in field:
+                    if change["new"] == MISSING:
+                        updated.pop(field, None)
+                    else:
+                        updated[field] = change["new"]
+            if any(field in entry["fields"] for field in SLOT_FIELDS):
+                self.remove(entry["key"])
+                self.add(updated)
+                moves.append({"kind": "moved", "id": entry["key"], "title": updated.get("title"),
+                              "from": self._where(session), "to": self._where(updated)})
+            else:
+                self.sessions[entry["key"]] = updated
+        return moves
+
+    @staticmethod
+    def _where(session: dict) -> dict:
+        return {field: session.get(field) for field in SLOT_FIELDS}
+
+    # ─── QUERIES ──────────────────────────────────────────
+
+    def _timelines(self, date: str, venue: str = None, room: str = None):
+        for key in self.by_date.get(date, ()):
+            if (venue is None or key[1] == venue) and (room is None or key[2] == room):
+                yield key, self.rooms[key]
+
+    def _entry(self, timeline: RoomTimeline, i: int) -> dict:
+        session = self.sessions[timeline.ids[i]]
+        return {
+            "id": timeline.ids[i],
+            "title": session.get("title"),
+            "venue": session.get("venue"),
+            "room": session.get("room"),
+            "start": format_minutes(timeline.starts[i]),
+            "end": format_minutes(timeline.ends[i]),
+        }
+
+    def now(self, date: str, at, venue: str = None, room: str = None) -> list:
+        """Sessions live at `at` (minutes or 'HH:MM')."""
+        minute = to_minutes(at)
+        return [self._entry(timeline, i)
+                for key, timeline in self._timelines(date, venue, room)
+                for i in timeline.live(minute)]
+
+    def next(self, date: str, at, venue: str = None, room: str = None) -> list:
+        """The next session to start after `at` in every matching room, soonest first."""
+        minute = to_minutes(at)
+        upcoming = []
+        for key, timeline in self._timelines(date, venue, room):
+            i = timeline.next_after(minute)
+            if i is not None:
+                upcoming.append((timeline.starts[i], key, self._entry(timeline, i)))
+        return [entry for _, _, entry in sorted(upcoming, key=lambda item: item[:2])]
+
+    def free_rooms(self, date: str, at, until=None, venue: str = None) -> list:
+        """(venue, room) pairs with no session between `at` and `until` (default: right now)."""
+        start = to_minutes(at)
+        end = to_minutes(until) if until is not None else start + 1
+        return [key[1:] for key, timeline in self._timelines(date, venue) if timeline.is_free(start, end)]
+
+
+def print_sessions(entries: list):
+    for e in entries:
+        print(f"  {e['start']}-{e['end']}  {e['venue']} / {e['room']}")
+        print(f"      [{e['id']}] {(e['title'] or '')[:70]}")
+
+
+def _describe_slot(slot: dict) -> str:
+    if not slot:
+        return "-"
+    return f"{slot.get('date')} {(slot.get('start_time') or '')[:5]} {slot.get('room')}"
+
+
+def print_moves(moves: list, limit: int = 20):
+    for move in moves[:limit]:
+        print(f"  {move['kind']:<8} [{move['id']}] {(move['title'] or '')[:45]}: "
+              f"{_describe_slot(move['from'])} -> {_describe_slot(move['to'])}")
+    if len(moves) > limit:
+        print(f"  ... {len(moves) - limit} more")
+
+
+def bench(index: OccupancyIndex, rounds: int = 20000):
+    dates = sorted(index.by_date)
+    queries = [(dates[i % len(dates)], 540 + (i * 7) % 540) for i in range(rounds)]
+    for name, fn in (("now", index.now), ("next", index.next), ("free", index.free_rooms)):
+        start = time.perf_counter()
+        for date, minute in queries:
+            fn(date, minute)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<5} {elapsed / rounds * 1e6:8.1f} µs/query ({rounds} queries)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Room x time occupancy queries")
+    parser.add_argument("command", choices=["now", "next", "free", "bench"])
+    parser.add_argument("--data", default=EVENTS_PATH, help="sessions/events JSON")
+    parser.add_argument("--date")
+    parser.add_argument("--time", help="HH:MM")
+    parser.add_argument("--until", help="HH:MM (free)")
+    parser.add_argument("--venue")
+    parser.add_argument("--room")
+    args = parser.parse_args()
+
+    with open(args.data, "r", encoding="utf-8") as f:
+        sessions = json.load(f)
+    start = time.perf_counter()
+    index = OccupancyIndex.build(sessions)
+    print(f"Indexed {len(index.sessions)} sessions in {len(index.rooms)} room-days "
+          f"({time.perf_counter() - start:.3f}s, {len(index.unplaced)} without date/time)")
+
+    if args.command == "bench":
+        bench(index)
+        return 0
+    if not args.date or not args.time:
+        parser.error(f"{args.command} needs --date and --time")
+
+    if args.command == "now":
+        entries = index.now(args.date, args.time, args.venue, args.room)
+        print(f"\nLive at {args.date} {args.time}: {len(entries)}")
+        print_sessions(entries)
+    elif args.command == "next":
+        entries = index.next(args.date, args.time, args.venue, args.room)
+        print(f"\nUp next after {args.date} {args.time}: {len(entries)} rooms")
+        print_sessions(entries)
+    else:
+        rooms = index.free_rooms(args.date, args.time, args.until, args.venue)
+        print(f"\nFree at {args.date} {args.time}{' - ' + args.until if args.until else ''}: {len(rooms)} rooms")
+        for venue, room in rooms:
+            print(f"  {venue} / {room}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Production Data Read API
+Small asyncio HTTP/1.1 server for data/production/events.json and
+exhibitors.json, so data corrections go live without redeploying the web app.
+
+- GET /events, /exhibitors       full datasets
+- GET /events?date=2026-02-19&venue=Bharat%20Mandapam&ids=4598,4601
+- GET /exhibitors?ids=1,2,3
+- GET /healthz                   dataset versions
+
+Responses carry strong ETags, are served pre-gzipped when the client
+accepts gzip, answer If-None-Match with 304, and the datasets are swapped
+atomically when the files on disk change (once the new file passes
+validate_data.py; otherwise the previous version stays live).
+
+Usage:
+    python serve_data.py [--host 127.0.0.1] [--port 8765] [--data-dir DIR] [--reload-interval 2]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "3-deduplication"))
+from validate_data import validate_records  # noqa: E402
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data"))
+PRODUCTION_DIR = os.path.join(DATA_DIR, "production")
+
+DATASETS = {
+    "events": "events.json",
+    "exhibitors": "exhibitors.json",
+}
+
+# validate_data.py profile a reloaded file must pass before it is swapped in
+PROFILES = {
+    "events": "events",
+    "exhibitors": "exhibitors",
+}
+
+# query parameters each dataset can be filtered on (besides ids)
+FILTER_FIELDS = {
+    "events": ("date", "venue", "room", "session_type"),
+    "exhibitors": (),
+}
+
+VIEW_CACHE_SIZE = 256
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class Body:
+    """One encoded response body with its gzip variant and ETags."""
+
+    __slots__ = ("raw", "gzipped", "etag", "gzip_etag")
+
+    def __init__(self, payload):
+        self.raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.gzipped = gzip.compress(self.raw, compresslevel=6, mtime=0)
+        digest = hashlib.sha256(self.raw).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+
+
+class Dataset:
+    """Immutable parsed copy of one file; replaced wholesale on reload."""
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        stat = os.stat(path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        with open(path, "r", encoding="utf-8") as f:
+            self.records = json.load(f)
+        if not isinstance(self.records, list) or not all(isinstance(r, dict) for r in self.records):
+            raise ValueError(f"{os.path.basename(path)} is not a JSON array of objects")
+        self.full = Body(self.records)
+        self.version = self.full.etag.strip('"')
+        self.by_id = {}
+        for record in self.records:
+            self.by_id.setdefault(record.get("id"), record)
+        self.views = OrderedDict()
+
+    def view(self, params: dict) -> Body:
+        """Filtered body for normalized query params, memoized per dataset version."""
+        key = tuple(sorted((k, tuple(v)) for k, v in params.items()))
+        if not key:
+            return self.full
+        body = self.views.get(key)
+        if body is not None:
+            self.views.move_to_end(key)
+            return body
+
+        if "ids" in params:
+            wanted = []
+            for chunk in params["ids"]:
+                for raw_id in chunk.split(","):
+                    raw_id = raw_id.strip()
+                    if raw_id:
+                        wanted.append(int(raw_id) if raw_id.lstrip("-").isdigit() else raw_id)
+            records = [self.by_id[i] for i in dict.fromkeys(wanted) if i in self.by_id]
+        else:
+            records = self.records
+        for field in FILTER_FIELDS[self.name]:
+            if field in params:
+                allowed = set(params[field])
+                records = [r for r in records if r.get(field) in allowed]
+
+        body = Body(records)
+        self.views[key] = body
+        if len(self.views) > VIEW_CACHE_SIZE:
+            self.views.popitem(last=False)
+        return body
+
+
+class DataServer:
+    def __init__(self, data_dir: str = PRODUCTION_DIR, reload_interval: float = 2.0):
+        self.data_dir = data_dir
+        self.reload_interval = reload_interval
+        self.datasets = {name: Dataset(name, os.path.join(data_dir, filename))
+                         for name, filename in DATASETS.items()}
+        self.requests_served = 0
+        self.rejected = {}  # name -> signature of a file that failed to parse or validate
+
+    async def watch(self):
+        """Poll file signatures and hot-swap datasets whose files changed."""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            for name, filename in DATASETS.items():
+                path = os.path.join(self.data_dir, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if signature in (self.datasets[name].signature, self.rejected.get(name)):
+                    continue
+                try:
+                    dataset = await asyncio.to_thread(Dataset, name, path)
+                except (ValueError, OSError) as e:
+                    # Half-written or invalid file: keep serving the old copy
+                    self.rejected[name] = signature
+                    print(f"  ⚠️  Reload of {filename} failed, keeping previous version: {e}")
+                    continue
+                report = await asyncio.to_thread(validate_records, dataset.records, PROFILES[name], filename)
+                if not report["ok"]:
+                    self.rejected[name] = dataset.signature
+                    print(f"  ⚠️  Reload of {filename} rejected, keeping previous version: "
+                          f"{report['errors']} validation errors ({', '.join(report['failed_rules'])})")
+                    continue
+                self.datasets[name] = dataset
+                print(f"  ✓ Reloaded {filename}: {len(dataset.records)} records (version {dataset.version[:12]})")
+
+    def route(self, method: str, target: str, headers: dict) -> tuple:
+        """(status, headers, body bytes) for one request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+
+        if path == "/healthz":
+            payload = {name: {"version": d.version, "records": len(d.records)}
+                       for name, d in self.datasets.items()}
+            return 200, {"Content-Type": "application/json", "Cache-Control": "no-store"}, \
+                json.dumps(payload).encode("utf-8")
+
+        name = path.lstrip("/")
+        dataset = self.datasets.get(name)
+        if dataset is None:
+            return 404, {"Content-Type": "application/json"}, b'{"error":"not found"}'
+
+        params = parse_qs(url.query)
+        unknown = set(params) - set(FILTER_FIELDS[name]) - {"ids"}
+        if unknown:
+            return 400, {"Content-Type": "application/json"}, \
+                json.dumps({"error": f"unsupported filters: {sorted(unknown)}"}).encode("utf-8")
+        body = dataset.view(params)
+
+        use_gzip = "gzip" in headers.get("accept-encoding", "")
+        etag = body.gzip_etag if use_gzip else body.etag
+        response_headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",
+        }
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or
+                              etag in [t.strip() for t in if_none_match.split(",")]):
+            return 304, response_headers, b""
+        if use_gzip:
+            response_headers["Content-Encoding"] = "gzip"
+            return 200, response_headers, body.gzipped
+        return 200, response_headers, body.raw
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write(writer, 431, {}, b"", keep_alive=False)
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._write(writer, 400, {}, b"", keep_alive=False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                status, response_headers, body = self.route(method, target, headers)
+                self.requests_served += 1
+                await self._write(writer, status, response_headers, b"" if method == "HEAD" else body,
+                                  keep_alive, content_length=len(body))
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _write(self, writer, status: int, headers: dict, body: bytes,
+                     keep_alive: bool, content_length: int = None):
+        reason = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+                  405: "Method Not Allowed", 431: "Request Header Fields Too Large"}.get(status, "")
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        if status != 304:
+            lines.append(f"Content-Length: {len(body) if content_length is None else content_length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        self._watcher = asyncio.create_task(self.watch())
+        return server
+
+
+async def serve(host: str, port: int, reload_interval: float, data_dir: str = PRODUCTION_DIR):
+    data_server = DataServer(data_dir, reload_interval)
+    server = await data_server.start(host, port)
+    print("=" * 60)
+    print(f"Serving production data on http://{host}:{port}")
+    print("=" * 60)
+    for name, dataset in data_server.datasets.items():
+        print(f"  /{name}: {len(dataset.records)} records, {len(dataset.full.raw):,} bytes "
+              f"({len(dataset.full.gzipped):,} gzipped)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve production datasets over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-dir", default=PRODUCTION_DIR, help="directory holding the dataset files")
+    parser.add_argument("--reload-interval", type=float, default=2.0,
+                        help="seconds between checks for changed data files")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.reload_interval, args.data_dir))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()